@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import logging
 import os
 import pathlib
@@ -163,10 +164,13 @@ app.mount("/", StaticFiles(directory=str(pathlib.Path(__file__).parent.parent.pa
 async def startup_event():
     logger.info(f"Starting up {settings.PROJECT_NAME} API")
     
+    # Broadcasts from scan threads are handed over to this loop
+    from backend.api.routers.messenger_websocket import frontend_backend_messenger
+    frontend_backend_messenger.bind_loop(asyncio.get_running_loop())
+    
     # Initialize Neo4j connection and schema - completely optional
     try:
         # Set a very short timeout to avoid blocking startup
-        import asyncio
         await asyncio.wait_for(
             asyncio.to_thread(_initialize_neo4j),
             timeout=3.0  # 3 second timeout
@@ -212,6 +216,11 @@ async def shutdown_event():
             logger.info("All lidar scan sessions stopped.")
     except Exception as e:
         logger.warning(f"Exception while stopping lidar scan sessions: {e}")
+    try:
+        from backend.api.startup_tasks import flush_task_updates
+        await flush_task_updates()
+    except Exception as e:
+        logger.warning(f"Exception while flushing pending task updates: {e}")
     neo4j_db.close()
 
 # Direct startup for development/testing
@@ -230,5 +239,6 @@ if __name__ == "__main__":
         port=port,
         reload=False,
         log_level="info",
-        access_log=True
+        access_log=True,
+        ws_per_message_deflate=False
     )
@@ -213,7 +213,7 @@ async def handle_llm_task_message(message: str, context: dict = None):
             user_id = context["user"]["email"]
 
         # Pass command and user_id; TaskManager will handle all user/admin checks
-        execution_result = system_task_manager.execute_command(command, user_id=user_id)
+        execution_result = await system_task_manager.execute_command_async(command, user_id=user_id)
         logger.info(f"[DEBUG] TaskManager execution result: {execution_result}")
         # 4. Compose final response based on execution result
         if execution_result.get("success"):
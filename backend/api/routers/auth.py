@@ -2,6 +2,7 @@
 Authentication router for Google OAuth and JWT management.
 """
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 import uuid
@@ -24,6 +25,10 @@ settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
 
+# Verified HS256 token payloads, so repeat connections with the same token skip the signature check
+TOKEN_CACHE_MAX_ENTRIES = 4096
+_token_payload_cache: dict = {}
+
 # Request and response models
 class GoogleTokenRequest(BaseModel):
     token: str
@@ -136,17 +141,38 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail="Internal server error"
         )
 
+def decode_access_token_cached(token: str) -> dict:
+    """
+    Decode and verify an internal HS256 token, reusing the payload of a token verified before.
+    Cached payloads are only returned until their 'exp'; raises jwt.JWTError like jwt.decode.
+    """
+    payload = _token_payload_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    _token_payload_cache.pop(token, None)
+    payload = jwt.decode(
+        token, 
+        settings.JWT_SECRET_KEY, 
+        algorithms=[settings.JWT_ALGORITHM]
+    )
+    if "exp" in payload:
+        if len(_token_payload_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+            now = time.time()
+            for cached_token in [t for t, p in _token_payload_cache.items() if p["exp"] <= now]:
+                del _token_payload_cache[cached_token]
+            if len(_token_payload_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+                # Still full of live tokens: drop the oldest entry
+                del _token_payload_cache[next(iter(_token_payload_cache))]
+        _token_payload_cache[token] = payload
+    return payload
+
 async def get_current_user_optional(token: Optional[str] = None) -> Optional[dict]:
     """Get current user from JWT token (optional - returns None if no valid token)."""
     if not token:
         return None
         
     try:
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = decode_access_token_cached(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
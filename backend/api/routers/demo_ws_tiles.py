@@ -1,24 +1,25 @@
 import json
 import asyncio
+from bisect import bisect_right
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from pathlib import Path
 import numpy as np
 from lidar_factory.factory import LidarMapFactory
 import os
-import json as pyjson
-from backend.utils.gcs_utils import get_gcs_bucket, upload_blob, download_blob, blob_exists, safe_download_blob
+from backend.utils.gcs_utils import get_gcs_bucket, download_blob
+from backend.utils.level_cache import LevelCache
 import time
 
 router = APIRouter()
 
+# Elevation colour lookup: bucket upper bounds and the colour for each bucket
+_ELEV_BOUNDS = [0, 10, 50, 100]
+_ELEV_COLORS = ['#006633', '#E5FFCC', '#662A00', '#D8D8D8', '#F5F5F5']
+
 def elevation_to_color(elev):
     if elev is None:
         return '#888888'
-    if elev < 0: return '#006633'
-    if elev < 10: return '#E5FFCC'
-    if elev < 50: return '#662A00'
-    if elev < 100: return '#D8D8D8'
-    return '#F5F5F5'
+    return _ELEV_COLORS[bisect_right(_ELEV_BOUNDS, elev)]
 
 @router.websocket("/ws/demo-tiles")
 async def ws_demo_tiles(websocket: WebSocket, task_id: str = Query(...)):
@@ -72,8 +73,9 @@ async def ws_demo_tiles(websocket: WebSocket, task_id: str = Query(...)):
             "grid_y": grid_y,
             "total_tiles": total_tiles
         })
-        lats = np.linspace(start_lat, start_lat + height_km / 111, grid_y)
-        lons = np.linspace(start_lon, start_lon + width_km / (111 * 0.7), grid_x)
+        # Tile origin spacing (same points as linspace over grid_y/grid_x samples)
+        lat_step = (height_km / 111) / (grid_y - 1) if grid_y > 1 else 0.0
+        lon_step = (width_km / (111 * 0.7)) / (grid_x - 1) if grid_x > 1 else 0.0
         factory = LidarMapFactory()
         bucket = get_gcs_bucket("re_archaeology")
         # Progressive resolution levels (coarse to fine)
@@ -99,33 +101,25 @@ async def ws_demo_tiles(websocket: WebSocket, task_id: str = Query(...)):
                 res = level["res"]
                 subtiles_per_side = level["subtiles"]
                 print(f"[WS] Streaming level {level_idx} at {res}m, {subtiles_per_side}x{subtiles_per_side} subtiles per tile", flush=True)
+                level_cache = LevelCache.load(bucket, task_id, level_idx, grid_y * subtiles_per_side, grid_x * subtiles_per_side)
+                level_cache_dirty = False
                 for coarse_row in range(grid_y):
                     for coarse_col in range(grid_x):
-                        tile_lat0 = lats[coarse_row]
-                        tile_lon0 = lons[coarse_col]
-                        tile_lat1 = lats[coarse_row+1] if coarse_row+1 < grid_y else lats[coarse_row]
-                        tile_lon1 = lons[coarse_col+1] if coarse_col+1 < grid_x else lons[coarse_col]
+                        tile_lat0 = start_lat + lat_step * coarse_row
+                        tile_lon0 = start_lon + lon_step * coarse_col
+                        tile_lat1 = tile_lat0 + lat_step if coarse_row+1 < grid_y else tile_lat0
+                        tile_lon1 = tile_lon0 + lon_step if coarse_col+1 < grid_x else tile_lon0
                         # Batch all subtiles for this tile
                         subtile_msgs = []
                         for subtile_row in range(subtiles_per_side):
                             for subtile_col in range(subtiles_per_side):
-                                # Use legacy path for cache key
-                                cache_key = f"tasks/{task_id}/cache/subtile_data/level_{level_idx}/tile_{coarse_row}_{coarse_col}/subtile_{subtile_row}_{subtile_col}.json"
-                                # --- GCS cache read ---
-                                if blob_exists(bucket, cache_key):
-                                    cached_bytes = safe_download_blob(bucket, cache_key)
-                                    try:
-                                        cached = pyjson.loads(cached_bytes.decode("utf-8"))
-                                    except Exception:
-                                        cached = None
-                                    if isinstance(cached, dict):
-                                        elev = cached.get("elevation")
-                                        color = cached.get("color")
-                                        dataset = cached.get("dataset")
-                                    else:
-                                        elev = None
-                                        color = None
-                                        dataset = None
+                                py = coarse_row * subtiles_per_side + subtile_row
+                                px = coarse_col * subtiles_per_side + subtile_col
+                                # --- Packed level cache read ---
+                                cached = level_cache.get(py, px)
+                                if cached is not None:
+                                    elev, _, dataset = cached
+                                    color = elevation_to_color(elev)
                                 else:
                                     # Interpolate lat/lon for subtile center
                                     frac_y = (subtile_row + 0.5) / subtiles_per_side
@@ -138,13 +132,8 @@ async def ws_demo_tiles(websocket: WebSocket, task_id: str = Query(...)):
                                     dataset = patch.source_dataset if patch else None
                                     elev = float(np.nanmean(patch.data)) if patch and patch.data is not None else None
                                     color = elevation_to_color(elev)
-                                    # Save to demo GCS cache as JSON bytes
-                                    cache_data = {
-                                        "elevation": elev if elev is not None else 0,
-                                        "color": color,
-                                        "dataset": dataset
-                                    }
-                                    upload_blob(bucket, cache_key, pyjson.dumps(cache_data).encode("utf-8"), content_type="application/json")
+                                    level_cache.put(py, px, elev, list(bytes.fromhex(color[1:])), dataset)
+                                    level_cache_dirty = True
                                 subtile_msgs.append({
                                     "type": "tile",
                                     "coarse_row": coarse_row,
@@ -162,6 +151,8 @@ async def ws_demo_tiles(websocket: WebSocket, task_id: str = Query(...)):
                         for msg in subtile_msgs:
                             await websocket.send_json(msg)
                         await asyncio.sleep(0.002)
+                if level_cache_dirty:
+                    level_cache.save(bucket, task_id, level_idx)
                 await asyncio.sleep(0.1)
             await websocket.send_json({"type": "done"})
             print("[WS] All tiles sent.", flush=True)
@@ -47,6 +47,7 @@ from backend.api.routers.discovery_models import (
 from backend.api.routers.messenger_websocket import frontend_backend_messenger, EnhancedConnectionManager
 from backend.api.routers.discovery_sessions import (
     active_sessions,
+    add_session,
     session_patches,
     _active_detection_tasks,
     _session_detectors,
@@ -241,7 +242,7 @@ async def start_discovery_session(config: Dict[str, Any]):
             config=config
         )
         
-        active_sessions[session_id] = session
+        add_session(session_id, session)
         
         # Start discovery in background
         asyncio.create_task(run_discovery_session(session, frontend_backend_messenger))
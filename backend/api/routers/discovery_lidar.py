@@ -13,7 +13,7 @@ import json
 
 from backend.api.routers.discovery_utils import get_available_structure_types, get_profile_name_for_structure_type
 from backend.api.routers.discovery_models import SessionIdRequest
-from backend.api.routers.discovery_sessions import active_sessions, _active_detection_tasks, _session_tile_data
+from backend.api.routers.discovery_sessions import active_sessions, add_session, _active_detection_tasks, _session_tile_data
 from backend.api.routers.messenger_websocket import frontend_backend_messenger
 from lidar_factory.factory import LidarMapFactory
 
@@ -98,7 +98,7 @@ async def start_lidar_scan(
             "tile_queue": [],
             "current_tile_index": 0
         }
-        active_sessions[session_id] = session_info
+        add_session(session_id, session_info)
         if enable_detection:
             await frontend_backend_messenger.send_message({
                 "type": "detection_starting",
@@ -2,19 +2,43 @@
 Session management logic for discovery API.
 Contains session state, helper functions, and session-related globals.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from .discovery_models import DiscoverySession, ScanPatch
 import asyncio
 
 # Global session state (move from discovery.py)
 active_sessions: Dict[str, DiscoverySession] = {}
 session_patches: Dict[str, List[ScanPatch]] = {}
+# Reverse index task_id -> session ids; kept in sync by add_session/remove_session
+sessions_by_task: Dict[str, Set[str]] = {}
 
 # Background detection task management (centralized here for modularity)
 _active_detection_tasks: Dict[str, asyncio.Task] = {}
 _session_detectors: Dict[str, Any] = {}
 _session_tile_data: Dict[str, Dict[str, Any]] = {}
 
+def _session_task_id(session: Any) -> Optional[str]:
+    return session.get("task_id") if isinstance(session, dict) else None
+
+def add_session(session_id: str, session: Any):
+    """Register a session in active_sessions and the task index."""
+    active_sessions[session_id] = session
+    task_id = _session_task_id(session)
+    if task_id:
+        sessions_by_task.setdefault(task_id, set()).add(session_id)
+
+def remove_session(session_id: str) -> Any:
+    """Remove a session from active_sessions and the task index."""
+    session = active_sessions.pop(session_id, None)
+    task_id = _session_task_id(session)
+    if task_id:
+        task_sessions = sessions_by_task.get(task_id)
+        if task_sessions is not None:
+            task_sessions.discard(session_id)
+            if not task_sessions:
+                del sessions_by_task[task_id]
+    return session
+
 # You can add session helper functions here as needed, e.g.:
 def get_active_sessions_dict() -> Dict[str, Any]:
     """Return a dict of all active sessions as dicts."""
@@ -33,6 +57,7 @@ def get_active_sessions_dict() -> Dict[str, Any]:
 def clear_all_sessions():
     """Clear all session state."""
     active_sessions.clear()
+    sessions_by_task.clear()
     session_patches.clear()
 
 def force_clear_all_detectors():
@@ -1,5 +1,4 @@
 import os
-import glob
 import logging
 import traceback
 import numpy as np
@@ -29,9 +28,13 @@ def get_available_structure_types(app_root: str, logger: logging.Logger) -> Tupl
     try:
         logger.info(f"🔍 Scanning profiles directory: {profiles_dir}")
         logger.info(f"🔍 Directory exists: {os.path.exists(profiles_dir)}")
+        # One directory pass serves both the contents log and the profile file list
+        entries = []
         if os.path.exists(profiles_dir):
-            logger.info(f"🔍 Directory contents: {os.listdir(profiles_dir)}")
-        profile_files = glob.glob(f"{profiles_dir}/*.json")
+            with os.scandir(profiles_dir) as it:
+                entries = list(it)
+            logger.info(f"🔍 Directory contents: {[entry.name for entry in entries]}")
+        profile_files = [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
         logger.info(f"🔍 Found profile files: {profile_files}")
         for profile_file in profile_files:
             filename = os.path.basename(profile_file)
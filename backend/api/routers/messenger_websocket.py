@@ -1,8 +1,20 @@
+import asyncio
+import json
 import time
+import zlib
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Messages broadcast within this window are coalesced into one WebSocket frame
+BROADCAST_FLUSH_INTERVAL = 0.01
+MAX_BATCH_MESSAGES = 256
+OUTBOUND_QUEUE_SIZE = 1000
+# Broadcast frames at least this large are zlib-compressed once and sent as binary frames;
+# smaller ones go out as plain text. Per-message deflate is disabled in the server config,
+# so the same payload is not recompressed for every connection.
+BROADCAST_COMPRESS_MIN_BYTES = 1024
 
 class EnhancedConnectionManager:
     """Enhanced WebSocket connection manager with better status tracking"""
@@ -11,8 +23,23 @@ class EnhancedConnectionManager:
         self.connection_metadata: Dict[WebSocket, Dict] = {}
         self.session_connections: Dict[str, List[WebSocket]] = {}
         self.last_heartbeat: Dict[WebSocket, float] = {}
+        # Encoded broadcast frames waiting to be sent, per connection; each queue has one sender task
+        self.outbound_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.sender_tasks: Dict[WebSocket, asyncio.Task] = {}
+        # Encoded broadcasts waiting for the next flush, shared by all connections
+        self.pending_broadcasts: List[str] = []
+        self.flush_task: Optional[asyncio.Task] = None
+        # The event loop that owns the websockets and queues. Scans broadcast from their own
+        # thread/loop, so their messages are handed over to this loop before touching any state.
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Record the application event loop that owns all connection state."""
+        self.loop = loop
 
     async def connect(self, websocket: WebSocket, user_id: str = None):
+        if self.loop is None:
+            self.bind_loop(asyncio.get_running_loop())
         await websocket.accept()
         self.active_connections.append(websocket)
         self.connection_metadata[websocket] = {
@@ -23,6 +50,8 @@ class EnhancedConnectionManager:
             'messages_received': 0
         }
         self.last_heartbeat[websocket] = time.time()
+        self.outbound_queues[websocket] = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self.sender_tasks[websocket] = asyncio.create_task(self._sender_loop(websocket))
         await self.send_to_connection(websocket, {
             'type': 'connection_established',
             'timestamp': datetime.now().isoformat(),
@@ -34,17 +63,73 @@ class EnhancedConnectionManager:
             self.active_connections.remove(websocket)
         self.connection_metadata.pop(websocket, None)
         self.last_heartbeat.pop(websocket, None)
+        self.outbound_queues.pop(websocket, None)
+        sender = self.sender_tasks.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+
+    async def _sender_loop(self, websocket: WebSocket):
+        """Send the broadcast frames queued for one connection, in order."""
+        queue = self.outbound_queues[websocket]
+        try:
+            while True:
+                frame, message_count = await queue.get()
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+                if websocket in self.connection_metadata:
+                    self.connection_metadata[websocket]['messages_sent'] += message_count
+                    self.connection_metadata[websocket]['last_seen'] = datetime.now()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        self.disconnect(websocket)
+
+    async def _flush_broadcasts(self):
+        """
+        Build one frame from everything broadcast within BROADCAST_FLUSH_INTERVAL (a 'multi'
+        frame when there is more than one message), encode/compress it once and queue the
+        same frame for every connection. Runs only on the application loop.
+        """
+        await asyncio.sleep(BROADCAST_FLUSH_INTERVAL)
+        # Clear before draining: anything broadcast from here on schedules a fresh flush
+        self.flush_task = None
+        pending, self.pending_broadcasts = self.pending_broadcasts, []
+        for start in range(0, len(pending), MAX_BATCH_MESSAGES):
+            self._queue_frame(pending[start:start + MAX_BATCH_MESSAGES])
+
+    def _queue_frame(self, batch: List[str]):
+        """Encode one batch as a single frame and queue it for every connection."""
+        if len(batch) == 1:
+            text = batch[0]
+        else:
+            text = '{"type":"multi","payload":[' + ','.join(batch) + ']}'
+        frame = text
+        if len(text) >= BROADCAST_COMPRESS_MIN_BYTES:
+            frame = zlib.compress(text.encode('utf-8'))
+        failed_connections = []
+        for connection in self.active_connections:
+            queue = self.outbound_queues.get(connection)
+            if queue is None or connection.client_state != WebSocketState.CONNECTED:
+                failed_connections.append(connection)
+                continue
+            try:
+                queue.put_nowait((frame, len(batch)))
+            except asyncio.QueueFull:
+                # The client has stopped reading; drop it rather than buffer without bound
+                failed_connections.append(connection)
+        for connection in failed_connections:
+            self.disconnect(connection)
 
     async def send_to_connection(self, websocket: WebSocket, message: dict):
         try:
             if websocket.client_state != WebSocketState.CONNECTED:
                 return False
-            import json
-            try:
-                message_json = json.dumps(message)
-            except Exception:
-                message_json = json.dumps({'type': 'error', 'message': 'Serialization error in server message', 'timestamp': datetime.now().isoformat()})
-            await websocket.send_text(message_json)
+            await websocket.send_text(self._encode(message))
             if websocket in self.connection_metadata:
                 self.connection_metadata[websocket]['messages_sent'] += 1
                 self.connection_metadata[websocket]['last_seen'] = datetime.now()
@@ -55,21 +140,39 @@ class EnhancedConnectionManager:
         except Exception:
             return False
 
+    @staticmethod
+    def _encode(message: dict) -> str:
+        try:
+            return json.dumps(message)
+        except Exception:
+            return json.dumps({'type': 'error', 'message': 'Serialization error in server message', 'timestamp': datetime.now().isoformat()})
+
     async def send_message(self, message: dict):
+        """
+        Broadcast to all connections. The message is encoded once and queued for the next
+        flush; returns the number of connections it will be delivered to.
+        """
         if not self.active_connections:
             return 0
-        successful_sends = 0
-        failed_connections = []
-        for connection in self.active_connections:
-            success = await self.send_to_connection(connection, message)
-            if success:
-                successful_sends += 1
-            else:
-                if connection.client_state != WebSocketState.CONNECTED:
-                    failed_connections.append(connection)
-        for connection in failed_connections:
-            self.disconnect(connection)
-        return successful_sends
+        encoded = self._encode(message)
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if self.loop is not None and running_loop is not self.loop:
+            # Called from another thread (e.g. a scan's websocket loop): asyncio queues and
+            # tasks are not thread-safe, so queue the broadcast on the application loop
+            self.loop.call_soon_threadsafe(self._queue_broadcast, encoded)
+        else:
+            self._queue_broadcast(encoded)
+        return sum(1 for connection in self.active_connections
+                   if connection.client_state == WebSocketState.CONNECTED)
+
+    def _queue_broadcast(self, encoded: str):
+        """Add an encoded broadcast to the next flush. Must run on the application loop."""
+        self.pending_broadcasts.append(encoded)
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._flush_broadcasts())
 
     async def send_heartbeat(self):
         await self.send_message({
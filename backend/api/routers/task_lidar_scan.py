@@ -1,21 +1,106 @@
 import asyncio
-import json
+import orjson
+import math
 from backend.api.routers.messenger_websocket import frontend_backend_messenger
 import logging
 import threading
 import numpy as np
 from lidar_factory.factory import LidarMapFactory
-from backend.utils.gcs_utils import get_gcs_bucket, upload_blob, download_blob, blob_exists, safe_download_blob
+from backend.utils.gcs_utils import get_gcs_bucket, upload_blob, download_blob, safe_download_blob
+from backend.utils.level_cache import LevelCache
 from io import BytesIO
 from PIL import Image
 from google.api_core.exceptions import NotFound  # <-- Add this import
 import time
 import os
+import concurrent.futures
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 
+# Optional C nanmean (no NaN-mask allocation); falls back to NumPy when not installed
+try:
+    from bottleneck import nanmean as _bn_nanmean
+except ImportError:
+    _bn_nanmean = None
+
 # Delay import to avoid circular import
 system_task_manager = None
 
+
+def scan_bounds(start_lat: float, start_lon: float, width_km: float, height_km: float):
+    """(north_lat, south_lat, east_lon) of a task scan area; the west edge is start_lon."""
+    if height_km >= 0:
+        north_lat = start_lat + height_km / 2 / 111
+        south_lat = start_lat - height_km / 2 / 111
+    else:
+        north_lat = start_lat
+        south_lat = start_lat
+    mean_lat_rad = math.radians((north_lat + south_lat) / 2)
+    lon_scale = math.cos(mean_lat_rad)
+    if lon_scale < 1e-6:
+        lon_scale = 1e-6
+    east_lon = start_lon + width_km / (111 * lon_scale)
+    return north_lat, south_lat, east_lon
+
+
+def cached_level_tiles(bucket, task: dict, level_idx: int) -> list:
+    """
+    Decode a task's saved level cache (tasks/{id}/cache/level_{n}.npz) into lidar_tile
+    messages with the same fields the scan sends live, so clients can restore a level
+    that is still in progress. Empty if the task has no scan grid or the level has no cache.
+    """
+    grid_x = task.get("grid_x")
+    grid_y = task.get("grid_y")
+    levels = task.get("levels") or []
+    if not grid_x or not grid_y or not 0 <= level_idx < len(levels):
+        return []
+    subtiles_per_side = int(levels[level_idx]["subtiles"])
+    res = float(levels[level_idx]["res"])
+    img_h = grid_y * subtiles_per_side
+    img_w = grid_x * subtiles_per_side
+    level_cache = LevelCache.load(bucket, task["id"], level_idx, img_h, img_w)
+    start_lat, start_lon = task["start_coordinates"]
+    north_lat, south_lat, east_lon = scan_bounds(start_lat, start_lon, task["range"]["width_km"], task["range"]["height_km"])
+    # Per-subtile steps: pixel (py, px) of the level is one subtile
+    subtile_lat_step = (south_lat - north_lat) / img_h
+    subtile_lon_step = (east_lon - start_lon) / img_w
+    tiles = []
+    rows, cols = np.nonzero(level_cache.filled)
+    for py, px in zip(rows.tolist(), cols.tolist()):
+        elev, color, dataset = level_cache.get(py, px)
+        subtile_lat0 = north_lat + subtile_lat_step * py
+        subtile_lon0 = start_lon + subtile_lon_step * px
+        tiles.append({
+            "type": "lidar_tile",
+            "coarse_row": py // subtiles_per_side,
+            "coarse_col": px // subtiles_per_side,
+            "subtile_row": py % subtiles_per_side,
+            "subtile_col": px % subtiles_per_side,
+            "subtiles_per_side": subtiles_per_side,
+            "level": level_idx,
+            "elevation": elev if elev is not None else 0,
+            "color": color,
+            "dataset": dataset,
+            "resolution": res,
+            "lat": subtile_lat0 + subtile_lat_step / 2,
+            "lon": subtile_lon0 + subtile_lon_step / 2,
+            "subtile_lat0": subtile_lat0,
+            "subtile_lat1": subtile_lat0 + subtile_lat_step,
+            "subtile_lon0": subtile_lon0,
+            "subtile_lon1": subtile_lon0 + subtile_lon_step,
+            "task_id": task["id"]
+        })
+    return tiles
+
+
+def fast_nanmean(data) -> float:
+    """NaN-ignoring mean of a patch, returning NaN for empty input without a warning."""
+    if data.size == 0:
+        return float("nan")
+    if _bn_nanmean is not None:
+        return float(_bn_nanmean(data))
+    return float(np.nanmean(data))
+
 class LidarScanTaskManager:
     def __init__(self, parent_task_manager=None):
         self.parent_task_manager = parent_task_manager
@@ -35,9 +120,28 @@ class LidarScanTaskManager:
             thread_name_prefix="lidar-scan"
         )
         
+        # Separate pool for PNG encode/upload so snapshots overlap with the next level's scan
+        self.encode_executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_scans,
+            thread_name_prefix="lidar-encode"
+        )
+        self._pending_encodes = {}  # task_id -> list of snapshot encode futures
+        
+        # Per-thread scratch arrays reused across levels for snapshot rendering
+        self._scratch = threading.local()
+        
         # WebSocket message queue to batch sends
-        self.ws_message_queue = []
+        self.ws_message_queue = deque()
         self.ws_queue_lock = threading.Lock()
+        
+        # One long-lived event loop thread for all outgoing scan WebSocket messages
+        self._ws_loop = asyncio.new_event_loop()
+        self._ws_thread = threading.Thread(
+            target=self._ws_loop.run_forever,
+            name="lidar-ws-loop",
+            daemon=True
+        )
+        self._ws_thread.start()
 
     async def start_scan(self, task_id: str):
         """Start a LiDAR scan session asynchronously without blocking."""
@@ -82,6 +186,8 @@ class LidarScanTaskManager:
         """Clean up session data when task completes."""
         self.logger.info(f"[SCAN] Cleaning up session for task_id={task_id}")
         session_data = self.active_sessions.pop(task_id, None)
+        # Normally already drained by the scan thread; never drop futures unawaited
+        self._wait_pending_encodes(task_id)
         
         if task.exception():
             self.logger.error(f"[SCAN] Task {task_id} failed: {task.exception()}")
@@ -105,38 +211,23 @@ class LidarScanTaskManager:
                 task_bytes = safe_download_blob(bucket, task_blob_path, logger=self.logger)
             except Exception as e:
                 self.logger.error(f"[SCAN] Error downloading task file from GCS: {e}")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(frontend_backend_messenger.send_message({
-                        "type": "error", "message": f"Error downloading task file from GCS: {e}", "task_id": task_id
-                    }))
-                finally:
-                    loop.close()
+                self._send_websocket_message_wait({
+                    "type": "error", "message": f"Error downloading task file from GCS: {e}", "task_id": task_id
+                })
                 return
             if not task_bytes:
                 self.logger.info(f"[SCAN] Task file not found in GCS: {task_id}")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(frontend_backend_messenger.send_message({
-                        "type": "error", "message": f"Task file not found in GCS: {task_id}", "task_id": task_id
-                    }))
-                finally:
-                    loop.close()
+                self._send_websocket_message_wait({
+                    "type": "error", "message": f"Task file not found in GCS: {task_id}", "task_id": task_id
+                })
                 return
             try:
-                task = json.loads(task_bytes.decode("utf-8"))
+                task = orjson.loads(task_bytes)
             except Exception as e:
                 self.logger.error(f"[SCAN] Failed to parse task JSON for {task_id}: {e}")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(frontend_backend_messenger.send_message({
-                        "type": "error", "message": f"Failed to parse task JSON for {task_id}", "task_id": task_id
-                    }))
-                finally:
-                    loop.close()
+                self._send_websocket_message_wait({
+                    "type": "error", "message": f"Failed to parse task JSON for {task_id}", "task_id": task_id
+                })
                 return
             # --- Always update grid and levels in task profile at scan start ---
             # Use TaskManager to update the task profile
@@ -154,13 +245,13 @@ class LidarScanTaskManager:
                         tile_km = 5
                     else:
                         tile_km = 2
-                    grid_x = max(1, int(np.ceil(width_km / tile_km)))
-                    grid_y = max(1, int(np.ceil(height_km / tile_km)))
+                    grid_x = max(1, math.ceil(width_km / tile_km))
+                    grid_y = max(1, math.ceil(height_km / tile_km))
                     MAX_TILES = 80
                     if grid_x * grid_y > MAX_TILES:
                         scale = (grid_x * grid_y / MAX_TILES) ** 0.5
-                        grid_x = max(1, int(np.ceil(grid_x / scale)))
-                        grid_y = max(1, int(np.ceil(grid_y / scale)))
+                        grid_x = max(1, math.ceil(grid_x / scale))
+                        grid_y = max(1, math.ceil(grid_y / scale))
                     levels = [
                         {"res": 8.0, "subtiles": 1},
                         {"res": 4.0, "subtiles": 2},
@@ -211,13 +302,13 @@ class LidarScanTaskManager:
                 tile_km = 5
             else:
                 tile_km = 2
-            grid_x = max(1, int(np.ceil(width_km / tile_km)))
-            grid_y = max(1, int(np.ceil(height_km / tile_km)))
+            grid_x = max(1, math.ceil(width_km / tile_km))
+            grid_y = max(1, math.ceil(height_km / tile_km))
             MAX_TILES = 80
             if grid_x * grid_y > MAX_TILES:
                 scale = (grid_x * grid_y / MAX_TILES) ** 0.5
-                grid_x = max(1, int(np.ceil(grid_x / scale)))
-                grid_y = max(1, int(np.ceil(grid_y / scale)))
+                grid_x = max(1, math.ceil(grid_x / scale))
+                grid_y = max(1, math.ceil(grid_y / scale))
             levels = [
                 {"res": 8.0, "subtiles": 1},
                 {"res": 4.0, "subtiles": 2},
@@ -226,28 +317,15 @@ class LidarScanTaskManager:
             ]
             total_tiles = sum((grid_x * grid_y) * (level["subtiles"] ** 2) for level in levels)
             # Compute bounds for frontend compatibility
-            if height_km >= 0:
-                north_lat = start_lat + height_km / 2 / 111
-                south_lat = start_lat - height_km / 2 / 111
-            else:
-                north_lat = start_lat
-                south_lat = start_lat
-            lats = np.linspace(north_lat, south_lat, grid_y + 1)
-            mean_lat_rad = np.deg2rad((north_lat + south_lat) / 2)
-            lon_scale = np.cos(mean_lat_rad)
-            if lon_scale < 1e-6:
-                lon_scale = 1e-6
-            lons = np.linspace(start_lon, start_lon + width_km / (111 * lon_scale), grid_x + 1)
+            north_lat, south_lat, east_lon = scan_bounds(start_lat, start_lon, width_km, height_km)
+            # Per-tile lat/lon steps (tile edges are computed inline in the scan loop)
+            lat_step = (south_lat - north_lat) / grid_y
+            lon_step = (east_lon - start_lon) / grid_x
             # Add bounds for frontend: [[south_lat, west_lon], [north_lat, east_lon]]
-            bounds = [[float(lats[-1]), float(lons[0])], [float(lats[0]), float(lons[-1])]]
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(frontend_backend_messenger.send_message({
-                    "type": "grid_info", "grid_x": grid_x, "grid_y": grid_y, "total_tiles": total_tiles, "task_id": task_id, "bounds": bounds
-                }))
-            finally:
-                loop.close()
+            bounds = [[float(south_lat), float(start_lon)], [float(north_lat), float(east_lon)]]
+            self._send_websocket_message_wait({
+                "type": "grid_info", "grid_x": grid_x, "grid_y": grid_y, "total_tiles": total_tiles, "task_id": task_id, "bounds": bounds
+            })
             factory = LidarMapFactory()
             for level_idx, level in enumerate(levels):
                 # Skip levels that have already been completed
@@ -262,8 +340,7 @@ class LidarScanTaskManager:
                 
                 # Check if task still exists before processing level
                 if self.parent_task_manager:
-                    task_obj = self.parent_task_manager.get_task(task_id)
-                    if not task_obj:
+                    if not self.parent_task_manager.task_exists(task_id):
                         self.logger.info(f"[SCAN] Task {task_id} no longer exists, stopping scan")
                         return
                 res = level["res"]
@@ -277,12 +354,15 @@ class LidarScanTaskManager:
                 import os
                 PROGRESSIVE_UPLOAD_EVERY = int(os.getenv("LIDAR_PROGRESSIVE_UPLOAD_EVERY", "100"))
                 tiles_since_last_upload = 0
+                # Packed per-level subtile cache: one GCS object per level, downloaded once
+                level_cache = LevelCache.load(bucket, task_id, level_idx, img_h, img_w, logger=self.logger)
+                elev_map[level_cache.filled] = level_cache.elev[level_cache.filled]
                 # --- Improvement: Track georeferencing for metadata ---
                 georef = {
                     "north_lat": float(north_lat),
                     "south_lat": float(south_lat),
                     "west_lon": float(start_lon),
-                    "east_lon": float(lons[-1]),
+                    "east_lon": float(east_lon),
                     "img_w": img_w,
                     "img_h": img_h,
                     "level": int(level_idx),
@@ -304,10 +384,12 @@ class LidarScanTaskManager:
                                 self.logger.info(f"[SCAN] Skipping completed cols 0-{resume_coarse_col-1} in row {coarse_row}, level {level_idx}")
                             continue
                             
-                        tile_lat0 = lats[real_coarse_row]
-                        tile_lon0 = lons[coarse_col]
-                        tile_lat1 = lats[real_coarse_row+1]
-                        tile_lon1 = lons[coarse_col+1]
+                        tile_lat0 = north_lat + lat_step * real_coarse_row
+                        tile_lon0 = start_lon + lon_step * coarse_col
+                        tile_lat1 = tile_lat0 + lat_step
+                        tile_lon1 = tile_lon0 + lon_step
+                        # Subtile messages for this coarse tile, sent as one lidar_tile_batch
+                        tile_batch = []
                         for subtile_row in range(subtiles_per_side):
                             real_subtile_row = subtile_row
                             for subtile_col in range(subtiles_per_side):
@@ -331,8 +413,7 @@ class LidarScanTaskManager:
                                 
                                 # Check if task still exists before processing subtile
                                 if self.parent_task_manager:
-                                    task_obj = self.parent_task_manager.get_task(task_id)
-                                    if not task_obj:
+                                    if not self.parent_task_manager.task_exists(task_id):
                                         self.logger.info(f"[SCAN] Task {task_id} no longer exists, stopping subtile processing")
                                         return
                                 
@@ -356,8 +437,7 @@ class LidarScanTaskManager:
                                     
                                     # Check if task still exists during throttling
                                     if self.parent_task_manager:
-                                        task_obj = self.parent_task_manager.get_task(task_id)
-                                        if not task_obj:
+                                        if not self.parent_task_manager.task_exists(task_id):
                                             self.logger.info(f"[SCAN] Task {task_id} no longer exists during throttling, stopping")
                                             return
                                 frac_y0 = real_subtile_row / subtiles_per_side
@@ -368,75 +448,29 @@ class LidarScanTaskManager:
                                 subtile_lat1 = tile_lat0 + (tile_lat1 - tile_lat0) * frac_y1
                                 subtile_lon0 = tile_lon0 + (tile_lon1 - tile_lon0) * frac_x0
                                 subtile_lon1 = tile_lon0 + (tile_lon1 - tile_lon0) * frac_x1
-                                cache_key = f"tasks/{task_id}/cache/subtile_data/level_{level_idx}/tile_{coarse_row}_{coarse_col}/subtile_{subtile_row}_{subtile_col}.json"
-                                if blob_exists(bucket, cache_key):
-                                    cached_bytes = safe_download_blob(bucket, cache_key, logger=self.logger)
-                                    try:
-                                        cached = json.loads(cached_bytes.decode("utf-8"))
-                                    except Exception:
-                                        cached = None
-                                    if isinstance(cached, dict):
-                                        elev = cached.get("elevation")
-                                        color = cached.get("color")
-                                        dataset = cached.get("dataset")
-                                        lat = cached.get("lat")
-                                        lon = cached.get("lon")
-                                        if lat is None or lon is None:
-                                            frac_y = (subtile_row + 0.5) / subtiles_per_side
-                                            frac_x = (subtile_col + 0.5) / subtiles_per_side
-                                            lat = tile_lat0 + (tile_lat1 - tile_lat0) * frac_y
-                                            lon = tile_lon0 + (tile_lon1 - tile_lon0) * frac_x
-                                            cached["lat"] = lat
-                                            cached["lon"] = lon
-                                            upload_blob(bucket, cache_key, json.dumps(cached).encode("utf-8"), content_type="application/json")
-                                        subtile_lat0_out = tile_lat0 + (tile_lat1 - tile_lat0) * (subtile_row / subtiles_per_side)
-                                        subtile_lat1_out = tile_lat0 + (tile_lat1 - tile_lat0) * ((subtile_row + 1) / subtiles_per_side)
-                                        subtile_lon0_out = tile_lon0 + (tile_lon1 - tile_lon0) * (subtile_col / subtiles_per_side)
-                                        subtile_lon1_out = tile_lon0 + (tile_lon1 - tile_lon0) * ((subtile_col + 1) / subtiles_per_side)
-                                        if not all(k in cached for k in ["subtile_lat0","subtile_lat1","subtile_lon0","subtile_lon1"]):
-                                            cached["subtile_lat0"] = subtile_lat0_out
-                                            cached["subtile_lat1"] = subtile_lat1_out
-                                            cached["subtile_lon0"] = subtile_lon0_out
-                                            cached["subtile_lon1"] = subtile_lon1_out
-                                            upload_blob(bucket, cache_key, json.dumps(cached).encode("utf-8"), content_type="application/json")
-                                    else:
-                                        elev = None
-                                        color = None
-                                        dataset = None
-                                        frac_y = (subtile_row + 0.5) / subtiles_per_side
-                                        frac_x = (subtile_col + 0.5) / subtiles_per_side
-                                        lat = tile_lat0 + (tile_lat1 - tile_lat0) * frac_y
-                                        lon = tile_lon0 + (tile_lon1 - tile_lon0) * frac_x
+                                # --- Patch: Map subtile position to pixel in elev_map / level cache ---
+                                px = coarse_col * subtiles_per_side + subtile_col
+                                py = coarse_row * subtiles_per_side + subtile_row
+                                frac_y = (subtile_row + 0.5) / subtiles_per_side
+                                frac_x = (subtile_col + 0.5) / subtiles_per_side
+                                lat = tile_lat0 + (tile_lat1 - tile_lat0) * frac_y
+                                lon = tile_lon0 + (tile_lon1 - tile_lon0) * frac_x
+                                cached = level_cache.get(py, px)
+                                if cached is not None:
+                                    elev, color, dataset = cached
                                 else:
-                                    frac_y = (subtile_row + 0.5) / subtiles_per_side
-                                    frac_x = (subtile_col + 0.5) / subtiles_per_side
-                                    lat = tile_lat0 + (tile_lat1 - tile_lat0) * frac_y
-                                    lon = tile_lon0 + (tile_lon1 - tile_lon0) * frac_x
                                     patch_size = 40 / subtiles_per_side
                                     patch_res = res
                                     patch = factory.get_patch(lat, lon, size_m=patch_size, preferred_resolution_m=patch_res, preferred_data_type="DSM", stop_event=stop_event)
                                     dataset = patch.source_dataset if patch else None
-                                    elev = float(np.nanmean(patch.data)) if patch and patch.data is not None else 0
+                                    elev = fast_nanmean(patch.data) if patch and patch.data is not None else 0
                                     color = self.elevation_to_color(elev)
-                                    cache_data = {
-                                        "elevation": elev if elev is not None else 0,
-                                        "color": color,
-                                        "dataset": dataset,
-                                        "lat": lat,
-                                        "lon": lon,
-                                        "subtile_lat0": subtile_lat0,
-                                        "subtile_lat1": subtile_lat1,
-                                        "subtile_lon0": subtile_lon0,
-                                        "subtile_lon1": subtile_lon1
-                                    }
-                                    upload_blob(bucket, cache_key, json.dumps(cache_data).encode("utf-8"), content_type="application/json")
+                                    level_cache.put(py, px, elev, color, dataset)
+                                    tiles_since_last_upload += 1
                                 # --- Patch: Write elevation value to elev_map for grayscale PNG ---
-                                # Map subtile position to pixel in elev_map
-                                px = coarse_col * subtiles_per_side + subtile_col
-                                py = coarse_row * subtiles_per_side + subtile_row
                                 if 0 <= py < img_h and 0 <= px < img_w:
                                     elev_map[py, px] = elev if elev is not None else np.nan
-                                # Queue WebSocket message for batch processing
+                                # Collect WebSocket message for the per-tile batch
                                 message = {
                                     "type": "lidar_tile",
                                     "coarse_row": coarse_row,
@@ -457,8 +491,7 @@ class LidarScanTaskManager:
                                     "subtile_lon1": float(subtile_lon1),
                                     "task_id": task_id
                                 }
-                                # Use optimized message queuing for reliable delivery
-                                self._queue_websocket_message(message)
+                                tile_batch.append(message)
                                 # --- Progress tracking and update ---
                                 # Calculate tile index for progress
                                 tile_index = (
@@ -469,82 +502,70 @@ class LidarScanTaskManager:
                                     + subtile_col
                                 )
                                 tiles_completed = tile_index + 1
-                                progress_overall = 100.0 * tiles_completed / total_tiles
-                                # Update task profile JSON in GCS
-                                try:
-                                    # Download latest task JSON (avoid race, but this is best-effort)
-                                    task_bytes = safe_download_blob(bucket, task_blob_path, logger=self.logger)
-                                    if task_bytes:
-                                        task_profile = json.loads(task_bytes.decode("utf-8"))
-                                    else:
-                                        task_profile = {}
-                                    # Update progress and grid info
-                                    task_profile["progress"] = {
-                                        "overall": progress_overall,
-                                        "tiles_completed": tiles_completed,
-                                        "total_tiles": total_tiles,
-                                        "level": int(level_idx),
-                                        "coarse_row": int(coarse_row),
-                                        "coarse_col": int(coarse_col),
-                                        "subtile_row": int(subtile_row),
-                                        "subtile_col": int(subtile_col)
-                                    }
-                                    task_profile["grid_x"] = int(grid_x)
-                                    task_profile["grid_y"] = int(grid_y)
-                                    # Ensure levels is serializable (list of dicts with only serializable values)
-                                    serializable_levels = []
-                                    for lvl in levels:
-                                        serializable_levels.append({
-                                            "res": float(lvl["res"]),
-                                            "subtiles": int(lvl["subtiles"])
-                                        })
-                                    task_profile["levels"] = serializable_levels
-                                    # Optionally update status
-                                    task_profile["status"] = "running"
-                                    upload_blob(bucket, task_blob_path, json.dumps(task_profile).encode("utf-8"), content_type="application/json")
-                                except Exception as e:
-                                    self.logger.warning(f"[SCAN] Failed to update progress for {task_id}: {e}")
-                # --- After all subtiles for this level, save PNG and metadata to GCS ---
-                # Patch: Normalize elev_map and save as grayscale PNG
-                valid = ~np.isnan(elev_map)
-                if np.any(valid):
-                    min_elev = np.nanmin(elev_map)
-                    max_elev = np.nanmax(elev_map)
-                    if max_elev > min_elev:
-                        norm = (elev_map - min_elev) / (max_elev - min_elev)
-                    else:
-                        norm = np.zeros_like(elev_map)
-                    img_arr = (255 * np.nan_to_num(norm)).astype(np.uint8)
+                                last_position = (tiles_completed, coarse_row, coarse_col, subtile_row, subtile_col)
+                                # The resume pointer is only written together with the level cache, so
+                                # every subtile it marks as done is in the cache after a restart
+                                if tiles_since_last_upload >= PROGRESSIVE_UPLOAD_EVERY:
+                                    self._save_scan_checkpoint(bucket, task_id, task_blob_path, level_cache, level_idx,
+                                                               last_position, total_tiles, grid_x, grid_y, levels)
+                                    tiles_since_last_upload = 0
+                        # Use optimized message queuing for reliable delivery
+                        if tile_batch:
+                            self._queue_websocket_message({
+                                "type": "lidar_tile_batch",
+                                "level": level_idx,
+                                "coarse_row": coarse_row,
+                                "coarse_col": coarse_col,
+                                "tiles": tile_batch,
+                                "task_id": task_id
+                            })
+                # --- After all subtiles for this level, save level cache, PNG and metadata to GCS ---
+                if tiles_since_last_upload > 0:
+                    self._save_scan_checkpoint(bucket, task_id, task_blob_path, level_cache, level_idx,
+                                               last_position, total_tiles, grid_x, grid_y, levels)
+                # Previous level's encode may still read the reused scratch buffers
+                self._wait_pending_encodes(task_id)
+                # Patch: Normalize elev_map once; gray and color snapshots are both derived from t
+                # Fast NaN check: NaN propagates through the sum, so clean rasters skip the mask pass
+                elev_sum = elev_map.sum()
+                has_nan = elev_sum != elev_sum
+                if has_nan:
+                    has_valid = not np.isnan(elev_map).all()
                 else:
-                    img_arr = np.zeros_like(elev_map, dtype=np.uint8)
-                img_gray = Image.fromarray(img_arr, mode='L')
-                with BytesIO() as buf:
-                    img_gray.save(buf, format="PNG")
-                    buf.seek(0)
-                    png_path = f"tasks/{task_id}/snapshots/level_{level_idx}_gray.png"
-                    upload_blob(bucket, png_path, buf.read(), content_type="image/png")
-                # --- New: Save color PNG using elevation_to_color with normalization ---
-                if np.any(valid):
-                    min_elev = np.nanmin(elev_map)
-                    max_elev = np.nanmax(elev_map)
+                    has_valid = elev_map.size > 0
+                if has_valid:
+                    min_elev = np.nanmin(elev_map) if has_nan else elev_map.min()
+                    max_elev = np.nanmax(elev_map) if has_nan else elev_map.max()
                 else:
                     min_elev = 0
                     max_elev = 1
-                color_img_arr = np.zeros((img_h, img_w, 3), dtype=np.uint8)
-                for y in range(img_h):
-                    for x in range(img_w):
-                        elev = elev_map[y, x]
-                        color = self.elevation_to_color(elev, min_elev, max_elev)
-                        color_img_arr[y, x] = color
-                img_color = Image.fromarray(color_img_arr, mode='RGB')
-                with BytesIO() as buf:
-                    img_color.save(buf, format="PNG")
-                    buf.seek(0)
-                    png_path = f"tasks/{task_id}/snapshots/level_{level_idx}_color.png"
-                    upload_blob(bucket, png_path, buf.read(), content_type="image/png")
-                meta_path = f"tasks/{task_id}/snapshots/level_{level_idx}_meta.json"
-                upload_blob(bucket, meta_path, json.dumps(georef).encode("utf-8"), content_type="application/json")
-                self.logger.info(f"[SCAN] Saved PNG snapshot and metadata for level {level_idx} to {png_path}")
+                flat = not max_elev > min_elev
+                if flat:
+                    # Gray stays black; color keeps elevation_to_color's default [0, 1] range
+                    min_elev, max_elev = 0, 1
+                t = (elev_map - min_elev) * np.float32(1.0 / (max_elev - min_elev))
+                np.clip(t, 0, 1, out=t)
+                img_arr = self._scratch_buffer("gray", (img_h, img_w), np.uint8)
+                color_img_arr = self._scratch_buffer("color", (img_h, img_w, 3), np.uint8)
+                # NaN pixels are cast to garbage here and overwritten from the mask below
+                with np.errstate(invalid='ignore'):
+                    if flat:
+                        img_arr.fill(0)
+                    else:
+                        np.multiply(t, 255, out=img_arr, casting='unsafe')
+                    # Same colormap as elevation_to_color, written channel by channel
+                    np.multiply(t, 255, out=color_img_arr[..., 0], casting='unsafe')
+                    np.subtract(1, t, out=t)
+                    np.multiply(t, 180, out=color_img_arr[..., 1], casting='unsafe')
+                    np.multiply(t, 255, out=color_img_arr[..., 2], casting='unsafe')
+                if has_nan:
+                    nan_mask = np.isnan(elev_map)
+                    img_arr[nan_mask] = 0
+                    color_img_arr[nan_mask] = (255, 0, 0)
+                # Encode PNGs and upload in the background while the next level scans
+                self._pending_encodes.setdefault(task_id, []).append(self.encode_executor.submit(
+                    self._encode_and_upload_snapshot, bucket, task_id, level_idx, img_arr, color_img_arr, georef
+                ))
                 # Final flush of any remaining messages
                 self._flush_websocket_queue()
                 
@@ -553,6 +574,7 @@ class LidarScanTaskManager:
             # End of for level_idx, level in enumerate(levels)
 
             # Final cleanup
+            self._wait_pending_encodes(task_id)
             self._flush_websocket_queue()
             time.sleep(0.2)
 
@@ -560,13 +582,13 @@ class LidarScanTaskManager:
             try:
                 task_bytes = safe_download_blob(bucket, task_blob_path, logger=self.logger)
                 if task_bytes:
-                    task_profile = json.loads(task_bytes.decode("utf-8"))
+                    task_profile = orjson.loads(task_bytes)
                 else:
                     task_profile = {}
                 import datetime
                 task_profile["status"] = "completed"
                 task_profile["completed_at"] = datetime.datetime.utcnow().isoformat() + "Z"
-                upload_blob(bucket, task_blob_path, json.dumps(task_profile).encode("utf-8"), content_type="application/json")
+                upload_blob(bucket, task_blob_path, orjson.dumps(task_profile, option=orjson.OPT_SERIALIZE_NUMPY), content_type="application/json")
                 self.logger.info(f"[SCAN] Task {task_id} marked as completed.")
                 # Also update upstream task_obj if available
                 if self.parent_task_manager:
@@ -581,16 +603,80 @@ class LidarScanTaskManager:
 
         except Exception as e:
             self.logger.error(f"[SCAN] Exception during scan for task_id={task_id}: {e}")
-            # Use new event loop in thread to avoid blocking
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(frontend_backend_messenger.send_message({
-                    "type": "error", "message": f"Exception during scan: {e}", "task_id": task_id
-                }))
-            finally:
-                loop.close()
+            # Report through the shared WebSocket loop
+            self._send_websocket_message_wait({
+                "type": "error", "message": f"Exception during scan: {e}", "task_id": task_id
+            })
             raise  # Re-raise to let _cleanup_session handle it
+        finally:
+            # Snapshot encodes read this thread's scratch buffers; every exit path (stop,
+            # deleted task, error) must wait for them before the thread takes another scan
+            self._wait_pending_encodes(task_id)
+
+    def _save_scan_checkpoint(self, bucket, task_id, task_blob_path, level_cache, level_idx,
+                              position, total_tiles, grid_x, grid_y, levels):
+        """
+        Save the level cache, then the resume pointer in the task JSON. The cache is written
+        first so a restart never skips subtiles that are missing from it.
+        """
+        level_cache.save(bucket, task_id, level_idx)
+        tiles_completed, coarse_row, coarse_col, subtile_row, subtile_col = position
+        try:
+            # Download latest task JSON (avoid race, but this is best-effort)
+            task_bytes = safe_download_blob(bucket, task_blob_path, logger=self.logger)
+            if task_bytes:
+                task_profile = orjson.loads(task_bytes)
+            else:
+                task_profile = {}
+            # Update progress and grid info
+            task_profile["progress"] = {
+                "overall": 100.0 * tiles_completed / total_tiles,
+                "tiles_completed": tiles_completed,
+                "total_tiles": total_tiles,
+                "level": int(level_idx),
+                "coarse_row": int(coarse_row),
+                "coarse_col": int(coarse_col),
+                "subtile_row": int(subtile_row),
+                "subtile_col": int(subtile_col)
+            }
+            task_profile["grid_x"] = int(grid_x)
+            task_profile["grid_y"] = int(grid_y)
+            # Ensure levels is serializable (list of dicts with only serializable values)
+            task_profile["levels"] = [
+                {"res": float(lvl["res"]), "subtiles": int(lvl["subtiles"])} for lvl in levels
+            ]
+            task_profile["status"] = "running"
+            upload_blob(bucket, task_blob_path, orjson.dumps(task_profile, option=orjson.OPT_SERIALIZE_NUMPY), content_type="application/json")
+        except Exception as e:
+            self.logger.warning(f"[SCAN] Failed to update progress for {task_id}: {e}")
+
+    def _encode_and_upload_snapshot(self, bucket, task_id, level_idx, img_arr, color_img_arr, georef):
+        """Encode the gray and color level snapshots as PNG and upload them with their metadata."""
+        try:
+            # frombuffer aliases the numpy memory (readonly) instead of copying it into Pillow storage
+            img_arr = np.ascontiguousarray(img_arr)
+            img_gray = Image.frombuffer('L', (img_arr.shape[1], img_arr.shape[0]), img_arr, 'raw', 'L', 0, 1)
+            with BytesIO() as buf:
+                img_gray.save(buf, format="PNG")
+                png_path = f"tasks/{task_id}/snapshots/level_{level_idx}_gray.png"
+                upload_blob(bucket, png_path, buf.getvalue(), content_type="image/png")
+            color_img_arr = np.ascontiguousarray(color_img_arr)
+            img_color = Image.frombuffer('RGB', (color_img_arr.shape[1], color_img_arr.shape[0]), color_img_arr, 'raw', 'RGB', 0, 1)
+            with BytesIO() as buf:
+                img_color.save(buf, format="PNG")
+                png_path = f"tasks/{task_id}/snapshots/level_{level_idx}_color.png"
+                upload_blob(bucket, png_path, buf.getvalue(), content_type="image/png")
+            meta_path = f"tasks/{task_id}/snapshots/level_{level_idx}_meta.json"
+            upload_blob(bucket, meta_path, orjson.dumps(georef), content_type="application/json")
+            self.logger.info(f"[SCAN] Saved PNG snapshot and metadata for level {level_idx} to {png_path}")
+        except Exception as e:
+            self.logger.warning(f"[SCAN] Failed to save snapshot for level {level_idx} of {task_id}: {e}")
+
+    def _wait_pending_encodes(self, task_id: str):
+        """Block until all background snapshot encodes for a task have finished."""
+        futures = self._pending_encodes.pop(task_id, [])
+        if futures:
+            concurrent.futures.wait(futures)
 
     async def stop_scan(self, task_id: str, on_stopped_callback=None):
         """Stop a running LiDAR scan session with enhanced robustness."""
@@ -636,15 +722,16 @@ class LidarScanTaskManager:
         # Clean up WebSocket message queue
         with self.ws_queue_lock:
             original_count = len(self.ws_message_queue)
-            self.ws_message_queue = [
+            self.ws_message_queue = deque(
                 msg for msg in self.ws_message_queue 
                 if msg.get('task_id') != task_id
-            ]
+            )
             cleaned_count = original_count - len(self.ws_message_queue)
             if cleaned_count > 0:
                 self.logger.debug(f"[SCAN] Cleaned {cleaned_count} queued messages for task {task_id}")
         
-        # Remove any orphaned callbacks
+        # Remove any orphaned callbacks. Pending encode futures are left alone: the scan thread
+        # waits on them before it exits, so its scratch buffers are not reused mid-encode.
         self.session_stopped_callbacks.pop(task_id, None)
         
         # Force remove from active sessions if still present
@@ -745,20 +832,15 @@ class LidarScanTaskManager:
     
     def _send_websocket_message_immediate(self, message):
         """Send a WebSocket message immediately for smooth frontend updates."""
-        # Use a separate thread to avoid blocking the scan loop
-        def send_message_async():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(frontend_backend_messenger.send_message(message))
-                finally:
-                    loop.close()
-            except Exception as e:
-                self.logger.warning(f"[SCAN] Failed to send immediate websocket message: {e}")
-        
-        # Use daemon thread for immediate, non-blocking send
-        threading.Thread(target=send_message_async, daemon=True).start()
+        # Schedule on the shared WebSocket loop without blocking the scan loop
+        asyncio.run_coroutine_threadsafe(self._send_websocket_messages([message]), self._ws_loop)
+
+    def _send_websocket_message_wait(self, message, timeout: float = 10.0):
+        """Send a WebSocket message on the shared loop and wait for it (used from scan threads)."""
+        try:
+            asyncio.run_coroutine_threadsafe(frontend_backend_messenger.send_message(message), self._ws_loop).result(timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"[SCAN] Failed to send WebSocket message: {e}")
 
     def _queue_websocket_message(self, message):
         """Queue a WebSocket message for batch processing."""
@@ -769,30 +851,32 @@ class LidarScanTaskManager:
         """Flush queued WebSocket messages in batches."""
         messages_to_send = []
         with self.ws_queue_lock:
-            if self.ws_message_queue:
-                messages_to_send = self.ws_message_queue[:self.websocket_batch_size]
-                self.ws_message_queue = self.ws_message_queue[self.websocket_batch_size:]
+            # popleft keeps the lock hold time O(batch) regardless of queue depth
+            for _ in range(min(len(self.ws_message_queue), self.websocket_batch_size)):
+                messages_to_send.append(self.ws_message_queue.popleft())
         
         if messages_to_send:
-            # Send messages in a separate thread to avoid blocking
-            threading.Thread(
-                target=self._send_websocket_messages_sync,
-                args=(messages_to_send,),
-                daemon=True
-            ).start()
+            # Hand the batch to the shared WebSocket loop; returns immediately
+            asyncio.run_coroutine_threadsafe(self._send_websocket_messages(messages_to_send), self._ws_loop)
     
-    def _send_websocket_messages_sync(self, messages):
-        """Send WebSocket messages synchronously in a separate thread."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            for message in messages:
-                try:
-                    loop.run_until_complete(frontend_backend_messenger.send_message(message))
-                except Exception as e:
-                    self.logger.warning(f"[SCAN] Failed to send WebSocket message: {e}")
-        finally:
-            loop.close()
+    async def _send_websocket_messages(self, messages):
+        """Send WebSocket messages in order on the shared WebSocket loop."""
+        for message in messages:
+            try:
+                await frontend_backend_messenger.send_message(message)
+            except Exception as e:
+                self.logger.warning(f"[SCAN] Failed to send WebSocket message: {e}")
+    
+    def _scratch_buffer(self, name, shape, dtype):
+        """Return a reusable per-thread scratch array sliced to `shape`, growing it when needed."""
+        buf = getattr(self._scratch, name, None)
+        if buf is None or buf.dtype != dtype or buf.ndim != len(shape):
+            buf = np.empty(shape, dtype=dtype)
+            setattr(self._scratch, name, buf)
+        elif any(b < n for b, n in zip(buf.shape, shape)):
+            buf = np.empty(tuple(max(b, n) for b, n in zip(buf.shape, shape)), dtype=dtype)
+            setattr(self._scratch, name, buf)
+        return buf[tuple(slice(0, n) for n in shape)]
     
     def get_resource_stats(self):
         """Get current resource usage statistics."""
@@ -809,6 +893,10 @@ class LidarScanTaskManager:
         """Cleanup thread pool on destruction."""
         if hasattr(self, 'scan_executor'):
             self.scan_executor.shutdown(wait=False)
+        if hasattr(self, 'encode_executor'):
+            self.encode_executor.shutdown(wait=False)
+        if hasattr(self, '_ws_loop'):
+            self._ws_loop.call_soon_threadsafe(self._ws_loop.stop)
 
     def elevation_to_color(self, elev, min_elev=None, max_elev=None):
         """
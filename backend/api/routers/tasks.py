@@ -1,24 +1,259 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone
-import json
+from datetime import datetime, timedelta, timezone
+import orjson
+import hashlib
+import numpy as np
 import os
-import glob
+import sys
+import time
 from pathlib import Path
 from backend.utils import gcs_utils
 from backend.utils.config import settings
 import logging
 import asyncio
 import uuid  # Added missing import
-from backend.api.routers.task_lidar_scan import LidarScanTaskManager
+from backend.api.routers.task_lidar_scan import LidarScanTaskManager, cached_level_tiles
+from lidar_factory.factory import LidarMapFactory
 import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import NotFound, PreconditionFailed
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.TASKS_LOG_LEVEL)
 
 # GCS bucket and prefix for tasks data
 GCS_BUCKET_NAME = os.getenv('GCS_TASKS_BUCKET', 're_archaeology')
 GCS_TASKS_PREFIX = 'tasks/'
 
+# In-process cache of parsed tasks, keyed on the (name, generation) listing of task blobs.
+# Within TASK_CACHE_TTL seconds of the last refresh the listing itself is skipped.
+TASK_CACHE_TTL = float(os.getenv('TASK_CACHE_TTL_SECONDS', '10'))
+# "views" memoizes get_tasks results per (status, min_decay) for the current "data".
+# "norm_index" maps stripped, lowercased ids to tasks, built on first use.
+# "blobs" maps each task blob name to (generation, task) so refreshes download only changed blobs.
+_task_cache = {"ts": 0.0, "blobs": {}, "day": None, "data": None, "views": {}, "norm_index": None}
+_task_cache_lock = threading.Lock()
+# Parallel blob downloads when (re)building the task cache
+TASK_DOWNLOAD_WORKERS = 16
+# Decay persisted in task JSON is reused for this long before being recomputed on read
+DECAY_MAX_AGE_DAYS = 1
+# Partial listing response: only the metadata the loader reads
+TASK_LIST_FIELDS = "items(name,generation,metadata),prefixes,nextPageToken"
+# Partial listing response for name-only listings
+TASK_NAME_FIELDS = "items(name),nextPageToken"
+# Rough km-per-degree conversions used for task areas (longitude adjusted for mid latitudes)
+KM_PER_DEG_LAT = 111
+KM_PER_DEG_LON = 111 * 0.7
+# Minimum seconds between progress uploads during a scan session
+PROGRESS_FLUSH_INTERVAL = 2.0
+# Heavy fields left out of GET /tasks list entries unless include_findings=true
+TASK_SUMMARY_EXCLUDED_FIELDS = frozenset({"findings"})
+# Version of the stored task layout; older blobs are migrated by _ensure_v2_schema
+TASK_SCHEMA_VERSION = 2
+# Navigation zoom by largest task dimension: <=5 km city, <=15 district, <=50 regional, else country
+_ZOOM_THRESHOLDS = (5, 15, 50)
+_ZOOM_LEVELS = (14, 12, 10, 8)
+
+_bucket = None
+_bucket_lock = threading.Lock()
+
+def _get_bucket():
+    """Tasks bucket handle, created once and shared (the GCS client is thread-safe)."""
+    global _bucket
+    if _bucket is None:
+        with _bucket_lock:
+            if _bucket is None:
+                _bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, gcs_utils.get_gcs_client())
+    return _bucket
+
+def invalidate_task_cache():
+    """Force the next task load to re-list GCS (call after writing or deleting a task)."""
+    with _task_cache_lock:
+        _task_cache["ts"] = 0.0
+
+def _download_blob_bytes(blob) -> Optional[bytes]:
+    """Download one listed blob; None if it was deleted since the listing or could not be read."""
+    try:
+        return blob.download_as_bytes()
+    except NotFound:
+        return None
+    except Exception:
+        logger.exception("Error downloading task blob %s", blob.name)
+        return None
+
+def _serialize_task(task_data: Dict[str, Any]) -> bytes:
+    """Task JSON as stored in GCS (compact: blobs are machine-read)."""
+    return orjson.dumps(task_data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def _task_blob_metadata(task_data: Dict[str, Any]) -> Dict[str, str]:
+    """Custom object metadata mirrored from the task, readable from a blob listing without a download."""
+    return {"status": str(task_data.get("status", "")), "updated_at": str(task_data.get("updated_at", ""))}
+
+def _ensure_v2_schema(task_data: Dict[str, Any]) -> bool:
+    """
+    Migrate a task dict in place to the current stored schema.
+    Returns True if anything changed (i.e. the stored blob is legacy).
+    The checks are cheap key probes, so they always run: writers outside
+    save_task_data (e.g. set_progress, startup progress updates) may still
+    store a scalar progress under a v2 stamp.
+    """
+    changed = task_data.get("schema_version") != TASK_SCHEMA_VERSION
+    if isinstance(task_data.get("progress"), (int, float)):
+        changed = True
+        progress_val = task_data["progress"]
+        task_data["progress"] = {
+            "scan": progress_val,
+            "detection": progress_val if task_data.get("status") == "completed" else 0,
+            "overall": progress_val
+        }
+    if "profiles" not in task_data:
+        changed = True
+        task_data["profiles"] = ["default_windmill"]
+    task_data["schema_version"] = TASK_SCHEMA_VERSION
+    return changed
+
+def _rewrite_migrated_task(item) -> None:
+    """Write a migrated legacy task back over its blob, unless the blob changed since it was read."""
+    blob, task_data = item
+    try:
+        blob.metadata = _task_blob_metadata(task_data)
+        blob.upload_from_string(_serialize_task(task_data), content_type='application/json',
+                                if_generation_match=blob.generation)
+    except PreconditionFailed:
+        # A concurrent writer got there first; its write replaces the legacy blob anyway
+        logger.info("Task blob %s changed since it was read; skipping migration rewrite", blob.name)
+    except Exception:
+        # Never let one failed write-back abort the listing it was found in
+        logger.exception("Could not rewrite migrated task blob %s", blob.name)
+
+def _download_tasks(bucket, task_blobs) -> Dict[str, Dict[str, Any]]:
+    """Download the given task blobs as blob name -> task; legacy blobs are migrated and rewritten."""
+    task_dict = {}
+    if not task_blobs:
+        return task_dict
+    migrated = []
+    # Downloads are latency-bound and release the GIL, so fan them out over threads;
+    # parsing and dedup stay on this thread
+    with ThreadPoolExecutor(max_workers=min(TASK_DOWNLOAD_WORKERS, len(task_blobs))) as executor:
+        downloaded = list(executor.map(_download_blob_bytes, task_blobs))
+    for blob, data_bytes in zip(task_blobs, downloaded):
+        if not data_bytes:
+            continue
+        try:
+            task_data = orjson.loads(data_bytes)
+        except orjson.JSONDecodeError:
+            # One bad blob must not empty the whole listing
+            logger.exception("Skipping unreadable task blob %s", blob.name)
+            continue
+        # Current-schema blobs pass straight through
+        if _ensure_v2_schema(task_data):
+            migrated.append((blob, task_data))
+        # Parsed JSON holds only plain types; numpy values are converted by orjson at save time
+        task_dict[blob.name] = task_data
+    # One-time write-back so the next read of these tasks needs no migration
+    if migrated:
+        with ThreadPoolExecutor(max_workers=min(TASK_DOWNLOAD_WORKERS, len(migrated))) as executor:
+            list(executor.map(_rewrite_migrated_task, migrated))
+    return task_dict
+
+def _fill_decay(tasks) -> None:
+    """Set decay_value on each task: persisted value where fresh, the rest in one vectorized batch."""
+    now = datetime.now(timezone.utc)
+    stale = []
+    for task_data in tasks:
+        stored = _stored_decay(task_data, now)
+        if stored is None:
+            stale.append(task_data)
+        else:
+            task_data["decay_value"] = stored
+    if stale:
+        for task_data, decay in zip(stale, calculate_task_decays(stale, now)):
+            task_data["decay_value"] = decay
+
+def _list_task_blobs(bucket) -> list:
+    """
+    List top-level task blobs. Every writer stores a task at tasks/<id>.json and
+    only live object versions are listed, so there is exactly one blob per task.
+    """
+    # delimiter='/' leaves archive/ and per-task subfolders out of the listing
+    blobs = gcs_utils.list_blobs(bucket, prefix=GCS_TASKS_PREFIX, fields=TASK_LIST_FIELDS, delimiter='/')
+    return [blob for blob in blobs if blob.name.endswith('.json')]
+
+def _load_tasks_by_status(status_filter: str) -> List[Dict[str, Any]]:
+    """
+    Cold-cache status query: download only blobs whose listed metadata status matches
+    (blobs written before status metadata existed are downloaded and checked).
+    """
+    try:
+        bucket = _get_bucket()
+        candidates = [
+            blob for blob in _list_task_blobs(bucket)
+            if (blob.metadata or {}).get("status", status_filter) == status_filter
+        ]
+        tasks = [task for task in _download_tasks(bucket, candidates).values() if task.get('status') == status_filter]
+        _fill_decay(tasks)
+    except Exception:
+        logger.exception("Error accessing tasks in GCS")
+        return []
+    return tasks
+
+def load_tasks_indexed() -> Dict[str, Dict[str, Any]]:
+    """
+    Load all tasks from GCS as an id -> task dict.
+    Within TASK_CACHE_TTL of the last refresh, cached tasks are returned without
+    touching GCS. After that, a refresh lists blob names and generations and
+    downloads only blobs that are new or whose generation changed; the rest
+    are reused from the cache.
+    The returned dict and its tasks are shared with the cache: treat them as
+    read-only and copy a task before mutating it.
+    """
+    tasks = {}
+    today = datetime.now(timezone.utc).date()
+    with _task_cache_lock:
+        fresh = (_task_cache["data"] is not None and _task_cache["day"] == today
+                 and time.monotonic() - _task_cache["ts"] < TASK_CACHE_TTL)
+        if fresh:
+            tasks = _task_cache["data"]
+    if fresh:
+        return tasks
+    try:
+        bucket = _get_bucket()
+        task_blobs = _list_task_blobs(bucket)
+        with _task_cache_lock:
+            cached_blobs = _task_cache["blobs"]
+            same_day = _task_cache["data"] is not None and _task_cache["day"] == today
+        changed = [blob for blob in task_blobs if cached_blobs.get(blob.name, (None,))[0] != blob.generation]
+        if not changed and same_day and len(task_blobs) == len(cached_blobs):
+            with _task_cache_lock:
+                tasks = _task_cache["data"]
+                _task_cache["ts"] = time.monotonic()
+        else:
+            downloaded = _download_tasks(bucket, changed)
+            blob_tasks = {}
+            for blob in task_blobs:
+                if blob.name in downloaded:
+                    blob_tasks[blob.name] = (blob.generation, downloaded[blob.name])
+                elif blob.name in cached_blobs and cached_blobs[blob.name][0] == blob.generation:
+                    blob_tasks[blob.name] = cached_blobs[blob.name]
+            # Decay depends on elapsed days: new tasks always, every task when the day rolled over
+            _fill_decay([task for _, task in blob_tasks.values()] if not same_day else downloaded.values())
+            tasks = {task['id']: task for _, task in blob_tasks.values()}
+            with _task_cache_lock:
+                _task_cache["ts"] = time.monotonic()
+                _task_cache["blobs"] = blob_tasks
+                _task_cache["day"] = today
+                _task_cache["data"] = tasks
+                _task_cache["views"] = {}
+                _task_cache["norm_index"] = None
+    except Exception:
+        logger.exception("Error accessing tasks in GCS")
+        tasks = tasks or {}
+    return tasks
+
 def load_all_tasks_from_gcs(status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Load all tasks from GCS. Optionally filter by status.
@@ -27,54 +262,38 @@ def load_all_tasks_from_gcs(status_filter: Optional[str] = None) -> List[Dict[st
     Returns:
         List of task dicts.
     """
-    task_dict = {}
-    try:
-        client = gcs_utils.get_gcs_client()
-        bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, client)
-        blobs = gcs_utils.list_blobs(bucket, prefix=GCS_TASKS_PREFIX)
-        for blob in blobs:
-            rel_path = blob.name[len(GCS_TASKS_PREFIX):]
-            # Skip archived tasks and any subfolders
-            if blob.name.startswith(f'{GCS_TASKS_PREFIX}archive/'):
-                continue
-            if not (blob.name.endswith('.json') and '/' not in rel_path):
-                continue
-            data_bytes = gcs_utils.safe_download_blob(bucket, blob.name, logger=logging.getLogger("backend.api.routers.tasks"))
-            if not data_bytes:
-                continue
-            task_data = json.loads(data_bytes.decode('utf-8'))
-            task_id = task_data['id']
-            if status_filter and task_data.get('status') != status_filter:
-                continue
-            if task_id not in task_dict or task_data['updated_at'] > task_dict[task_id]['updated_at']:
-                task_data["decay_value"] = calculate_task_decay(task_data)
-                if isinstance(task_data.get("progress"), (int, float)):
-                    progress_val = task_data["progress"]
-                    task_data["progress"] = {
-                        "scan": progress_val,
-                        "detection": progress_val if task_data["status"] == "completed" else 0,
-                        "overall": progress_val
-                    }
-                if "profiles" not in task_data:
-                    task_data["profiles"] = ["default_windmill"]
-                # Ensure all values are JSON-serializable (convert numpy types)
-                def to_serializable(val):
-                    import numpy as np
-                    if isinstance(val, (np.generic,)):
-                        return val.item()
-                    if isinstance(val, dict):
-                        return {k: to_serializable(v) for k, v in val.items()}
-                    if isinstance(val, list):
-                        return [to_serializable(v) for v in val]
-                    return val
-                task_data = to_serializable(task_data)
-                # Remove session logic
-                task_dict[task_id] = task_data
-    except Exception as e:
-        print(f"[ERROR] Error accessing tasks in GCS: {e}")
-        import traceback
-        traceback.print_exc()
-    return list(task_dict.values())
+    if status_filter:
+        today = datetime.now(timezone.utc).date()
+        with _task_cache_lock:
+            cold = _task_cache["data"] is None or _task_cache["day"] != today
+        # Without a warm cache (e.g. at startup), skip downloading tasks in other states
+        if cold:
+            return _load_tasks_by_status(status_filter)
+    tasks = load_tasks_indexed()
+    # Shallow copies so callers mutating task dicts do not alter the cache
+    return [dict(task) for task in tasks.values() if not status_filter or task.get('status') == status_filter]
+
+def load_task_from_gcs(task_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load one task with a direct GET of its blob (no listing), normalized like the
+    bulk loader. Returns None if no blob exists for this id.
+    """
+    if not task_id or '/' in task_id:
+        return None
+    bucket = _get_bucket()
+    data_bytes = _download_blob_bytes(bucket.blob(f"{GCS_TASKS_PREFIX}{task_id}.json"))
+    if not data_bytes:
+        return None
+    task_data = orjson.loads(data_bytes)
+    _ensure_v2_schema(task_data)
+    now = datetime.now(timezone.utc)
+    decay = _stored_decay(task_data, now)
+    task_data["decay_value"] = decay if decay is not None else calculate_task_decay(task_data, now)
+    return task_data
+
+def task_exists(task_id: str) -> bool:
+    """Cheap existence check against the cached task index (for polling loops)."""
+    return task_id in load_tasks_indexed()
 
 def load_existing_tasks() -> List[Dict[str, Any]]:
     """Legacy alias for API: load all tasks from GCS (no status filter)."""
@@ -84,70 +303,200 @@ def load_running_tasks_from_gcs() -> List[Dict[str, Any]]:
     """Helper for startup: load only running tasks from GCS."""
     return load_all_tasks_from_gcs(status_filter="running")
 
-def calculate_task_decay(task: Dict[str, Any]) -> float:
+def load_tasks_normalized_index() -> Dict[str, Dict[str, Any]]:
+    """Cached tasks keyed by stripped, lowercased id (read-only, like load_tasks_indexed)."""
+    tasks = load_tasks_indexed()
+    with _task_cache_lock:
+        if _task_cache["data"] is tasks and _task_cache["norm_index"] is not None:
+            return _task_cache["norm_index"]
+    norm_index = {str(t['id']).strip().lower(): t for t in tasks.values()}
+    with _task_cache_lock:
+        if _task_cache["data"] is tasks:
+            _task_cache["norm_index"] = norm_index
+    return norm_index
+
+def _task_summary(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Task without its heavy list fields; findings are replaced by findings_count."""
+    summary = {k: v for k, v in task.items() if k not in TASK_SUMMARY_EXCLUDED_FIELDS}
+    summary["findings_count"] = len(task.get("findings") or [])
+    return summary
+
+def _get_filtered_tasks(status: Optional[str], min_decay: float, include_findings: bool = False):
+    """
+    Tasks with decay_value >= min_decay (and matching status, if given), as
+    (JSON body, ETag), memoized per cached task set. Tasks are summaries
+    unless include_findings is set.
+    """
+    tasks = load_tasks_indexed()
+    key = (status, min_decay, include_findings)
+    with _task_cache_lock:
+        views = _task_cache["views"] if _task_cache["data"] is tasks else None
+        if views is not None and key in views:
+            return views[key]
+    filtered = [
+        task for task in tasks.values()
+        if task["decay_value"] >= min_decay and (not status or task["status"] == status)
+    ]
+    if not include_findings:
+        filtered = [_task_summary(task) for task in filtered]
+    # Serialize once per view; the ETag lets pollers revalidate without a body
+    body = orjson.dumps(filtered, option=orjson.OPT_SERIALIZE_NUMPY)
+    view = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+    if views is not None:
+        with _task_cache_lock:
+            views[key] = view
+    return view
+
+async def load_task_from_gcs_async(task_id: str) -> Optional[Dict[str, Any]]:
+    """load_task_from_gcs for async endpoints: GCS calls run in a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(load_task_from_gcs, task_id)
+
+def _stored_decay(task: Dict[str, Any], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Decay persisted at write time, or None if missing, older than DECAY_MAX_AGE_DAYS, or
+    stale. Other writers (progress/findings updates, scan checkpoints, migrations) change
+    the task without recomputing decay, so the stored value is only trusted while the task
+    still has the updated_at and findings count it was computed from.
+    """
+    stored = task.get("decay_value")
+    computed_at = task.get("decay_computed_at")
+    if (stored is not None and computed_at and computed_at == task.get("updated_at")
+            and task.get("decay_findings_count") == len(task.get("findings") or ())):
+        try:
+            age = (now or datetime.now(timezone.utc)) - datetime.fromisoformat(computed_at)
+            if age < timedelta(days=DECAY_MAX_AGE_DAYS):
+                return stored
+        except (TypeError, ValueError):
+            pass
+    return None
+
+# Python 3.11+ fromisoformat parses a trailing 'Z' itself
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+def _parse_iso_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, including the 'Z' UTC suffix."""
+    if _FROMISOFORMAT_ACCEPTS_Z:
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _created_at_ts(task: Dict[str, Any]) -> float:
+    """Creation time as epoch seconds, from the persisted created_at_ts or parsed from created_at."""
+    created_ts = task.get("created_at_ts")
+    if created_ts is None:
+        created_ts = _parse_iso_timestamp(task["created_at"]).timestamp()
+    return created_ts
+
+def _decay_inputs(task: Dict[str, Any]):
+    """Parse decay inputs: (created_at epoch seconds, findings count, mean score or None if any finding is unscored)."""
+    created_ts = _created_at_ts(task)
+    findings = task.get("findings") or []
+    # Single pass: count, score sum, and whether every finding is scored
+    count = 0
+    score_sum = 0.0
+    all_scored = True
+    for finding in findings:
+        count += 1
+        if not all_scored:
+            continue
+        if "score" in finding:
+            score_sum += finding["score"]
+        else:
+            all_scored = False
+    avg_score = score_sum / count if count and all_scored else None
+    return created_ts, count, avg_score
+
+def calculate_task_decay(task: Dict[str, Any], now: Optional[datetime] = None) -> float:
     """Calculate decay value based on findings quality and time"""
     try:
-        # Parse created_at timestamp
-        created_at = datetime.fromisoformat(task["created_at"].replace('Z', '+00:00'))
+        created_ts, findings_count, avg_score = _decay_inputs(task)
+        if now is None:
+            now = datetime.now(timezone.utc)
         
-        # Base decay from time
-        days_elapsed = (datetime.now(timezone.utc) - created_at).days
+        # Base decay from time (whole days elapsed)
+        days_elapsed = (now.timestamp() - created_ts) // 86400
         time_decay = 0.9 ** (days_elapsed / 7)  # 7-day half-life
         
         # Quality multiplier based on findings
-        findings = task.get("findings", [])
-        if not findings:
+        if findings_count == 0:
             quality_multiplier = 0.1  # Low value for tasks with no findings
+        elif avg_score is not None:
+            # If findings have scores, use them
+            quality_multiplier = min(1.0, avg_score / 0.8)
         else:
-            # If findings have scores, use them; otherwise use a default based on count
-            if all("score" in f for f in findings):
-                avg_score = sum(f["score"] for f in findings) / len(findings)
-                quality_multiplier = min(1.0, avg_score / 0.8)
-            else:
-                # Use findings count as a proxy for quality
-                quality_multiplier = min(1.0, len(findings) / 5.0)
+            # Use findings count as a proxy for quality
+            quality_multiplier = min(1.0, findings_count / 5.0)
         
         return time_decay * quality_multiplier
         
     except Exception:
         return 0.5  # Default decay value if calculation fails
 
+def calculate_task_decays(tasks: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[float]:
+    """Batch version of calculate_task_decay: parse per task, then evaluate the formula in one NumPy pass."""
+    now_ts = (now or datetime.now(timezone.utc)).timestamp()
+    n = len(tasks)
+    created = np.zeros(n)
+    counts = np.zeros(n)
+    avg_scores = np.zeros(n)
+    scored = np.zeros(n, dtype=bool)
+    valid = np.ones(n, dtype=bool)
+    for i, task in enumerate(tasks):
+        try:
+            created_ts, findings_count, avg_score = _decay_inputs(task)
+            created[i] = created_ts
+            if avg_score is not None:
+                avg_scores[i] = avg_score
+                scored[i] = True
+        except Exception:
+            valid[i] = False
+            continue
+        counts[i] = findings_count
+    days = np.floor_divide(now_ts - created, 86400)
+    time_decay = np.power(0.9, days / 7.0)
+    quality = np.where(
+        counts == 0,
+        0.1,
+        np.where(scored, np.minimum(1.0, avg_scores / 0.8), np.minimum(1.0, counts / 5.0))
+    )
+    return np.where(valid, time_decay * quality, 0.5).tolist()
+
 
-@router.get("/tasks", response_model=List[Dict[str, Any]])
+@router.get("/tasks", response_class=Response)
 async def get_tasks(
+    request: Request,
     status: Optional[str] = None,
-    min_decay: Optional[float] = 0.1
-) -> List[Dict[str, Any]]:
+    min_decay: Optional[float] = 0.1,
+    include_findings: bool = False
+) -> Response:
     """
     Get all tasks with optional filtering by status and minimum decay value.
     Only returns tasks with decay_value >= min_decay for frontend display.
+    Tasks carry findings_count instead of findings unless include_findings=true;
+    the full task is available from GET /tasks/{task_id}.
+    Supports If-None-Match: an unchanged list is answered with 304.
     """
     try:
-        # Load existing tasks from files
-        all_tasks = load_existing_tasks()
-        
-        # Filter tasks by decay value (backend filtering)
-        filtered_tasks = [task for task in all_tasks if task["decay_value"] >= min_decay]
-        
-        # Filter by status if provided
-        if status:
-            filtered_tasks = [task for task in filtered_tasks if task["status"] == status]
-        
-        return filtered_tasks
+        # Filtered views are cached with the task set; GCS work runs off the event loop
+        body, etag = await asyncio.to_thread(_get_filtered_tasks, status, min_decay, include_findings)
+        # no-cache: clients always revalidate, so new or updated tasks show up at once
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving tasks: {str(e)}")
 
 
-@router.get("/tasks/{task_id}", response_model=Dict[str, Any])
-async def get_task(task_id: str) -> Dict[str, Any]:
+@router.get("/tasks/{task_id}", response_class=ORJSONResponse)
+async def get_task(task_id: str) -> ORJSONResponse:
     """Get a specific task by ID"""
     try:
-        all_tasks = load_existing_tasks()
-        task = next((task for task in all_tasks if task["id"] == task_id), None)
+        task = await load_task_from_gcs_async(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        return task
+        # Returned as a response object so FastAPI skips the jsonable_encoder pass
+        return ORJSONResponse(task)
     
     except HTTPException:
         raise
@@ -155,46 +504,80 @@ async def get_task(task_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error retrieving task: {str(e)}")
 
 
-@router.post("/tasks/{task_id}/navigate")
-async def navigate_to_task(task_id: str) -> Dict[str, Any]:
+def load_cached_task_tiles(task_id: str, level: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Tiles saved in a task's level caches (one level, or every level), or None if the task is unknown."""
+    task = load_task_from_gcs(task_id)
+    if not task:
+        return None
+    bucket = _get_bucket()
+    level_count = len(task.get("levels") or [])
+    levels = [level] if level is not None else range(level_count)
+    tiles = []
+    for level_idx in levels:
+        tiles.extend(cached_level_tiles(bucket, task, level_idx))
+    return {"task_id": task_id, "grid_x": task.get("grid_x"), "grid_y": task.get("grid_y"), "tiles": tiles}
+
+@router.get("/tasks/{task_id}/tiles", response_class=ORJSONResponse)
+async def get_task_cached_tiles(task_id: str, level: Optional[int] = None) -> ORJSONResponse:
+    """
+    Subtiles already scanned for a task, decoded from its per-level caches as lidar_tile
+    messages. Lets clients restore the level in progress, which has no PNG snapshot yet.
+    """
+    try:
+        result = await asyncio.to_thread(load_cached_task_tiles, task_id, level)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return ORJSONResponse(result)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving cached tiles: {str(e)}")
+
+
+def compute_task_navigation(start_coordinates, task_range: Dict[str, Any]) -> Dict[str, Any]:
+    """Map bounds and optimal zoom for a task area; fixed for the life of the task."""
+    # Calculate optimal zoom based on range size
+    max_dimension = max(task_range["width_km"], task_range["height_km"])
+    optimal_zoom = _ZOOM_LEVELS[bisect_left(_ZOOM_THRESHOLDS, max_dimension)]
+    
+    return {
+        "bounds": {
+            "southwest": [
+                start_coordinates[0] - (task_range["height_km"] / KM_PER_DEG_LAT),  # Rough km to degree conversion
+                start_coordinates[1] - (task_range["width_km"] / KM_PER_DEG_LON)  # Adjusted for latitude
+            ],
+            "northeast": [
+                start_coordinates[0] + (task_range["height_km"] / KM_PER_DEG_LAT),
+                start_coordinates[1] + (task_range["width_km"] / KM_PER_DEG_LON)
+            ]
+        },
+        "optimal_zoom": optimal_zoom
+    }
+
+
+@router.post("/tasks/{task_id}/navigate", response_class=ORJSONResponse)
+async def navigate_to_task(task_id: str) -> ORJSONResponse:
     """
     Get navigation data for a specific task.
     Returns coordinates, bounds, and optimal zoom level.
     """
     try:
-        all_tasks = load_existing_tasks()
-        task = next((task for task in all_tasks if task["id"] == task_id), None)
+        task = await load_task_from_gcs_async(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        # Calculate optimal zoom based on range size
-        max_dimension = max(task["range"]["width_km"], task["range"]["height_km"])
-        if max_dimension <= 5:
-            optimal_zoom = 14  # City level
-        elif max_dimension <= 15:
-            optimal_zoom = 12  # District level
-        elif max_dimension <= 50:
-            optimal_zoom = 10  # Regional level
-        else:
-            optimal_zoom = 8   # Country level
+        # Bounds and zoom are stored at creation; compute them for legacy tasks
+        navigation = task.get("navigation") or compute_task_navigation(task["start_coordinates"], task["range"])
         
-        return {
+        return ORJSONResponse({
             "task_id": task_id,
             "center_coordinates": task["start_coordinates"],
-            "bounds": {
-                "southwest": [
-                    task["start_coordinates"][0] - (task["range"]["height_km"] / 111),  # Rough km to degree conversion
-                    task["start_coordinates"][1] - (task["range"]["width_km"] / (111 * 0.7))  # Adjusted for latitude
-                ],
-                "northeast": [
-                    task["start_coordinates"][0] + (task["range"]["height_km"] / 111),
-                    task["start_coordinates"][1] + (task["range"]["width_km"] / (111 * 0.7))
-                ]
-            },
-            "optimal_zoom": optimal_zoom,
+            "bounds": navigation["bounds"],
+            "optimal_zoom": navigation["optimal_zoom"],
             "range": task["range"],
             "status": task["status"]
-        }
+        })
     
     except HTTPException:
         raise
@@ -205,70 +588,94 @@ async def start_task_scanning_session(task_data: Dict[str, Any], stop_event: Opt
     """
     Start the scanning session for a task using the new Lidar scan logic from demo_ws_tiles.py.
     """
-    from lidar_factory.factory import LidarMapFactory
-    import numpy as np
     task = Task(task_data)
     try:
         task.logger.info(f"[SCAN] Starting Lidar scan for task {task.id}")
-        task.update_status('running', '')
-        task.set_progress(0)
+        await task.update_status_async('running', '')
+        await task.set_progress_async(0)
         # Extract scan parameters
         start_lat, start_lon = task.data["start_coordinates"]
         width_km = task.data["range"]["width_km"]
         height_km = task.data["range"]["height_km"]
         grid_x = max(1, round(width_km / 5))
         grid_y = max(1, round(height_km / 5))
-        lats = np.linspace(start_lat, start_lat + height_km / 111, grid_y)
-        lons = np.linspace(start_lon, start_lon + width_km / (111 * 0.7), grid_x)
-        factory = LidarMapFactory()
-        total_tiles = grid_x * grid_y
-        completed_tiles = 0
+        lats = np.linspace(start_lat, start_lat + height_km / KM_PER_DEG_LAT, grid_y)
+        lons = np.linspace(start_lon, start_lon + width_km / KM_PER_DEG_LON, grid_x)
+        # Row-major (lat, lon) pairs for every tile, built in one NumPy pass
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing='ij')
+        coords = list(zip(lat_grid.ravel().tolist(), lon_grid.ravel().tolist()))
+        total_tiles = len(coords)
         findings = []
-        for row in range(grid_y):
-            for col in range(grid_x):
-                # Check if stop requested
-                if stop_event and stop_event.is_set():
-                    task.logger.info(f"[SCAN] Stop requested during scanning for task {task.id}")
-                    return
-                
-                lat = lats[row]
-                lon = lons[col]
-                patch = factory.get_patch(lat, lon, size_m=40, preferred_resolution_m=5, preferred_data_type="DSM", stop_event=stop_event)
-                elev = float(np.nanmean(patch.data)) if patch and patch.data is not None else None
-                if elev is not None and elev > 0:
-                    findings.append({
-                        'id': str(uuid.uuid4()),
-                        'score': round(float(elev) / 100, 2),
-                        'lat': lat,
-                        'lon': lon,
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    })
-                completed_tiles += 1
-                progress = int(100 * completed_tiles / total_tiles)
-                task.set_progress(progress)
+        last_flush = time.monotonic()
+
+        def fetch_elevation(index: int):
+            lat, lon = coords[index]
+            patch = LidarMapFactory.get_patch(lat, lon, size_m=40, preferred_resolution_m=5, preferred_data_type="DSM", stop_event=stop_event)
+            elev = float(np.nanmean(patch.data)) if patch and patch.data is not None else None
+            return index, elev
+
+        # One tile at a time: get_patch shares an unsynchronised tile cache and is not
+        # reentrant, so each blocking fetch just runs in a worker thread off the event loop
+        for i in range(total_tiles):
+            # Check if stop requested
+            if stop_event and stop_event.is_set():
+                task.logger.info(f"[SCAN] Stop requested during scanning for task {task.id}")
+                await task.save_async()
+                return
+            index, elev = await asyncio.to_thread(fetch_elevation, i)
+            if elev is not None and elev > 0:
+                lat, lon = coords[index]
+                findings.append({
+                    'id': str(uuid.uuid4()),
+                    'score': round(float(elev) / 100, 2),
+                    'lat': lat,
+                    'lon': lon,
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                })
+            progress = int(100 * (index + 1) / total_tiles)
+            # Coalesce progress writes; complete() below persists the final state
+            task.set_progress_local(progress)
+            if time.monotonic() - last_flush >= PROGRESS_FLUSH_INTERVAL:
+                await task.save_async()
+                last_flush = time.monotonic()
         task.data['findings'] = findings
-        task.complete()
+        await task.complete_async()
         task.logger.info(f"[SCAN] Lidar scan completed for task {task.id} with {len(findings)} findings.")
     except Exception as e:
         task.logger.error(f"[SCAN] Error in Lidar scan for task {task.id}: {e}")
-        task.update_status('error', str(e))
+        await task.update_status_async('error', str(e))
 
 def save_task_data(task_data: Dict[str, Any]) -> bool:
     """Save task data to GCS as JSON (update or create new)."""
     try:
         task_id = task_data['id']
-        client = gcs_utils.get_gcs_client()
-        bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, client)
+        bucket = _get_bucket()
         blob_name = f"{GCS_TASKS_PREFIX}{task_id}.json"
         # Update the updated_at timestamp
-        task_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-        bucket.blob(blob_name).upload_from_string(json.dumps(task_data, indent=2), content_type='application/json')
-        logging.getLogger(__name__).info(f"✅ Updated task in GCS: {blob_name}")
+        now = datetime.now(timezone.utc)
+        task_data['updated_at'] = now.isoformat()
+        _ensure_v2_schema(task_data)
+        # Persist decay so readers can skip recomputing it
+        task_data['decay_value'] = calculate_task_decay(task_data, now)
+        task_data['decay_computed_at'] = task_data['updated_at']
+        task_data['decay_findings_count'] = len(task_data.get('findings') or ())
+        # Epoch form of created_at so decay on read skips ISO parsing
+        if 'created_at_ts' not in task_data and task_data.get('created_at'):
+            task_data['created_at_ts'] = _created_at_ts(task_data)
+        blob = bucket.blob(blob_name)
+        blob.metadata = _task_blob_metadata(task_data)
+        blob.upload_from_string(_serialize_task(task_data), content_type='application/json')
+        invalidate_task_cache()
+        logger.info("✅ Updated task in GCS: %s", blob_name)
         return True
     except Exception as e:
-        logging.getLogger(__name__).error(f"Error saving task data to GCS: {e}")
+        logger.error("Error saving task data to GCS: %s", e)
         return False
 
+async def save_task_data_async(task_data: Dict[str, Any]) -> bool:
+    """save_task_data for async callers: the GCS upload runs in a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(save_task_data, task_data)
+
 class Task:
     def __init__(self, data: Optional[Dict[str, Any]] = None, **kwargs):
         self.logger = logging.getLogger(__name__)
@@ -282,7 +689,11 @@ class Task:
         self.data.setdefault('progress', 0)
         self.data.setdefault('findings', [])
         self.data.setdefault('error_message', '')
-        self.data.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+        if 'created_at' not in self.data:
+            created = datetime.now(timezone.utc)
+            self.data['created_at'] = created.isoformat()
+            # Epoch twin of created_at so decay on read is a float subtraction
+            self.data['created_at_ts'] = created.timestamp()
         self.data.setdefault('updated_at', datetime.now(timezone.utc).isoformat())
         self.data.setdefault('profiles', ['default_windmill'])
         # Remove session manager and session fields
@@ -307,11 +718,20 @@ class Task:
         self.data['updated_at'] = datetime.now(timezone.utc).isoformat()
         save_task_data(self.data)
 
+    async def save_async(self):
+        self.data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        await save_task_data_async(self.data)
+
     def update_status(self, status: str, error_message: str = ""):
         self.data['status'] = status
         self.data['error_message'] = error_message
         self.save()
 
+    async def update_status_async(self, status: str, error_message: str = ""):
+        self.data['status'] = status
+        self.data['error_message'] = error_message
+        await self.save_async()
+
     def add_finding(self, finding: Dict[str, Any]):
         if 'findings' not in self.data or not isinstance(self.data['findings'], list):
             self.data['findings'] = []
@@ -322,33 +742,52 @@ class Task:
         self.data['progress'] = progress
         self.save()
 
+    async def set_progress_async(self, progress: int):
+        self.data['progress'] = progress
+        await self.save_async()
+
+    def set_progress_local(self, progress: int):
+        """Update progress in memory only; persisted by the next save()."""
+        self.data['progress'] = progress
+
     def complete(self):
         self.data['status'] = 'completed'
         self.data['completed_at'] = datetime.now(timezone.utc).isoformat()
         self.save()
 
+    async def complete_async(self):
+        self.data['status'] = 'completed'
+        self.data['completed_at'] = datetime.now(timezone.utc).isoformat()
+        await self.save_async()
+
     def to_dict(self):
         return self.data
 
     @classmethod
     def load(cls, task_id: str):
-        all_tasks = load_existing_tasks()
         logger = logging.getLogger(__name__)
+        # Exact id: one GET of the task blob, fresh and owned by this Task
+        try:
+            task = load_task_from_gcs(str(task_id))
+        except Exception as e:
+            logger.error(f"[Task.load] Error loading task {task_id} from GCS: {e}")
+            return None
+        if task is not None:
+            return cls(task)
+        # Ids differing only in case/whitespace resolve through the cached normalized index
         norm_task_id = str(task_id).strip().lower()
-        logger.info(f"[Task.load] Looking for task_id: {norm_task_id}")
-        found_ids = [str(t['id']).strip().lower() for t in all_tasks]
-        logger.info(f"[Task.load] All available task IDs: {found_ids}")
-        for t in all_tasks:
-            if str(t['id']).strip().lower() == norm_task_id:
-                logger.info(f"[Task.load] Found task with id: {t['id']}")
-                return cls(t)
-        # Fuzzy match: suggest close matches if any
-        from difflib import get_close_matches
-        close = get_close_matches(norm_task_id, found_ids, n=1, cutoff=0.8)
-        if close:
-            logger.warning(f"[Task.load] Task id {task_id} not found, but close match: {close[0]}")
-        else:
-            logger.warning(f"[Task.load] Task id {task_id} not found in available tasks.")
+        norm_index = load_tasks_normalized_index()
+        t = norm_index.get(norm_task_id)
+        if t is not None:
+            logger.info(f"[Task.load] Found task with id: {t['id']}")
+            return cls(dict(t))
+        if logger.isEnabledFor(logging.DEBUG):
+            # Fuzzy match: suggest close matches if any
+            from difflib import get_close_matches
+            close = get_close_matches(norm_task_id, list(norm_index), n=1, cutoff=0.8)
+            if close:
+                logger.debug(f"[Task.load] Task id {task_id} not found, close match: {close[0]}")
+        logger.warning(f"[Task.load] Task id {task_id} not found in available tasks.")
         return None
 
     @classmethod
@@ -400,11 +839,13 @@ class TaskManager:
     def new_task(self, start_coordinates, range_km, profiles, user_id, type_="scan") -> Task:
         width_km = range_km.get('width', range_km.get('width_km', 5))
         height_km = range_km.get('height', range_km.get('height_km', 5))
+        task_range = {"width_km": width_km, "height_km": height_km}
         task = Task(
             type=type_,
             status="running",
             start_coordinates=start_coordinates,
-            range={"width_km": width_km, "height_km": height_km},
+            range=task_range,
+            navigation=compute_task_navigation(start_coordinates, task_range),
             user_id=user_id,
             profiles=profiles
         )
@@ -415,6 +856,9 @@ class TaskManager:
     def get_task(self, task_id: str) -> Optional[Task]:
         return Task.load(task_id)
 
+    def task_exists(self, task_id: str) -> bool:
+        return task_exists(task_id)
+
     def list_tasks(self, status_filter: Optional[str] = None) -> list:
         return Task.all(status_filter)
 
@@ -472,36 +916,30 @@ class TaskManager:
                 self.logger.error(f"[TaskManager] Failed to cleanup resources for deleted task {task_id}: {cleanup_e}")
         # Move the task JSON to archive folder in GCS
         try:
-            client = gcs_utils.get_gcs_client()
-            bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, client)
+            bucket = _get_bucket()
             src_blob_name = f"{GCS_TASKS_PREFIX}{task_id}.json"
             dst_blob_name = f"{GCS_TASKS_PREFIX}archive/{task_id}.json"
             self.logger.info(f"[TaskManager] Attempting to delete/archive task. src_blob_name={src_blob_name}, dst_blob_name={dst_blob_name}")
-            # List all blobs under tasks/ for debug
-            all_blobs = list(bucket.list_blobs(prefix=GCS_TASKS_PREFIX))
-            all_blob_names = [b.name for b in all_blobs]
-            self.logger.info(f"[TaskManager] All blobs under {GCS_TASKS_PREFIX}: {all_blob_names}")
             # Use get_blob instead of exists for reliability
             src_blob = bucket.get_blob(src_blob_name)
             self.logger.info(f"[TaskManager] get_blob result for {src_blob_name}: {src_blob}")
             if not src_blob:
                 self.logger.warning(f"[TaskManager] Task {task_id} not found for deletion. src_blob_name={src_blob_name}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    # List task blobs (names only) to help diagnose the miss
+                    all_blobs = gcs_utils.list_blobs(bucket, prefix=GCS_TASKS_PREFIX, fields=TASK_NAME_FIELDS, delimiter='/')
+                    self.logger.debug(f"[TaskManager] Task blobs under {GCS_TASKS_PREFIX}: {[b.name for b in all_blobs]}")
                 return False
             bucket.copy_blob(src_blob, bucket, dst_blob_name)
             bucket.delete_blob(src_blob_name)
+            invalidate_task_cache()
             self.logger.info(f"[TaskManager] Task {task_id} archived to {dst_blob_name}")
             return True
         except Exception as e:
             self.logger.error(f"[TaskManager] Error archiving task {task_id}: {e}")
             return False
 
-    def execute_command(self, command: dict, user_id: Optional[str] = None, is_admin: bool = False) -> dict:
-        """
-        Execute a task command from a JSON/dict snippet (as from LLM/Bella).
-        Returns a dict: {success, message, data, ...}
-        """
-        from backend.api.routers.auth_utils import is_admin_user
-        import contextvars
+    def _resolve_user_id(self, user_id: Optional[str]) -> Optional[str]:
         # Try to get user info from FastAPI global request state if not provided
         if not user_id:
             try:
@@ -516,6 +954,63 @@ class TaskManager:
         # Fallback: try to get user from environment variable (for testing)
         if not user_id:
             user_id = os.environ.get('RE_ARCHAEOLOGY_SYSTEM_USER_EMAIL')
+        return user_id
+
+    async def execute_command_async(self, command: dict, user_id: Optional[str] = None, is_admin: bool = False) -> dict:
+        """
+        Async variant of execute_command for callers on the event loop.
+        pause/stop/abort await the scan shutdown on the running loop instead of
+        blocking it; all other actions delegate to execute_command.
+        """
+        action = command.get("action")
+        if action not in ("pause", "stop", "abort"):
+            return self.execute_command(command, user_id=user_id, is_admin=is_admin)
+        from backend.api.routers.auth_utils import is_admin_user
+        user_id = self._resolve_user_id(user_id)
+        try:
+            task_id = command.get("task_id")
+            if not is_admin_user(user_id):
+                return {"success": False, "message": f"Admin privileges required for action '{action}'."}
+            if not task_id:
+                return {"success": False, "message": f"Task ID required for action '{action}'."}
+            self.logger.info(f"[TaskManager] {action} requested for task_id: {task_id}")
+            # Validate task_id strictly
+            task = await asyncio.to_thread(self.get_task, task_id)
+            if not task:
+                self.logger.warning(f"[TaskManager] {action} failed: Task {task_id} not found.")
+                return {"success": False, "message": f"Task {task_id} not found."}
+            loop = asyncio.get_running_loop()
+            scan_stopped = asyncio.Event()
+            def on_scan_stopped(_):
+                loop.call_soon_threadsafe(scan_stopped.set)
+            try:
+                success = await asyncio.wait_for(
+                    lidar_scan_task_manager.stop_scan(task_id, on_stopped_callback=on_scan_stopped),
+                    timeout=10.0
+                )
+            except asyncio.TimeoutError:
+                success = False
+            if success:
+                try:
+                    await asyncio.wait_for(scan_stopped.wait(), timeout=2)  # Brief wait for callback
+                except asyncio.TimeoutError:
+                    pass
+                self.logger.info(f"[TaskManager] LiDAR scan stopped successfully for task {task_id}")
+            else:
+                self.logger.warning(f"[TaskManager] Failed to stop LiDAR scan for task {task_id}")
+            await task.update_status_async("paused")
+            return {"success": True, "message": f"Task {task_id} paused/stopped and lidar scan session stopped.", "task_id": task_id}
+        except Exception as e:
+            self.logger.error(f"[TaskManager] Exception in execute_command_async: {e}")
+            return {"success": False, "message": f"Error executing command: {e}"}
+
+    def execute_command(self, command: dict, user_id: Optional[str] = None, is_admin: bool = False) -> dict:
+        """
+        Execute a task command from a JSON/dict snippet (as from LLM/Bella).
+        Returns a dict: {success, message, data, ...}
+        """
+        from backend.api.routers.auth_utils import is_admin_user
+        user_id = self._resolve_user_id(user_id)
         try:
             action = command.get("action")
             task_id = command.get("task_id")
@@ -21,15 +21,15 @@ async def websocket_thread_endpoint(
 ):
     """WebSocket endpoint for real-time thread updates."""
     
-    # Validate user authentication if token provided
+    # Validate user authentication if token provided; verified tokens are cached, so
+    # reconnects with the same token skip the signature check
     user_id = None
     if token:
-        try:
-            # Note: In production, implement proper JWT validation here
-            # For now, we'll extract user_id from token (simplified)
-            user_id = token  # Simplified - should decode JWT
-        except Exception as e:
-            logger.warning(f"Invalid token in WebSocket connection: {e}")
+        current_user = await get_current_user_optional(token)
+        if current_user:
+            user_id = current_user["user_id"]
+        else:
+            logger.warning("Invalid token in WebSocket connection; continuing anonymously")
     
     try:
         # Connect to thread
@@ -3,32 +3,63 @@ Startup tasks module for restarting running archaeological tasks.
 Handles resuming LiDAR scanning and detection for tasks that were interrupted.
 """
 
-import json
+import orjson
 import logging
 import asyncio
-import numpy as np
+import math
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import os
+from functools import lru_cache
 
-from .routers.discovery_sessions import active_sessions
+from .routers.discovery_sessions import add_session, remove_session, sessions_by_task
 from .routers.messenger_websocket import frontend_backend_messenger
 from .routers.discovery_lidar import run_lidar_scan_async
 from .routers.discovery_utils import get_available_structure_types
 from backend.utils import gcs_utils
-from backend.api.routers.tasks import load_running_tasks_from_gcs
+from backend.api.routers.tasks import (
+    load_running_tasks_from_gcs, _serialize_task, _task_blob_metadata, _ensure_v2_schema
+)
+from google.api_core.exceptions import PreconditionFailed
 
 logger = logging.getLogger(__name__)
 
 # GCS bucket and prefix for tasks data
 GCS_BUCKET_NAME = os.getenv('GCS_TASKS_BUCKET', 're_archaeology')
 GCS_TASKS_PREFIX = 'tasks/'
+TASK_REWRITE_ATTEMPTS = 3
+RESTART_CONCURRENCY = 8
+# Each scan holds its own tile buffers, so cap how many restarted scans run at once
+RESTARTED_SCAN_CONCURRENCY = os.cpu_count() or 4
+_restarted_scan_semaphore = asyncio.Semaphore(RESTARTED_SCAN_CONCURRENCY)
+
+# Pending task JSON updates, one queue per task; each queue is drained by a single writer task
+# that flushes a batch every TASK_FLUSH_INTERVAL seconds, or sooner when it is signalled
+TASK_FLUSH_INTERVAL = 1.0
+TASK_FLUSH_MAX_PENDING = 32
+_task_update_queues: Dict[str, asyncio.Queue] = {}
+_task_flush_events: Dict[str, asyncio.Event] = {}
+_task_update_writers: Dict[str, asyncio.Task] = {}
+# Caps task rewrites in flight across all tasks (each holds a worker thread for its GCS calls)
+TASK_WRITE_CONCURRENCY = 8
+_task_write_semaphore = asyncio.Semaphore(TASK_WRITE_CONCURRENCY)
+# Last progress value queued for writing, per task (dropped once the task completes)
+_last_persisted_progress: Dict[str, float] = {}
+# Running tasks as last written by the updater: task_id -> (generation, task data)
+_task_snapshots: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# Application root, resolved once at import
+APP_ROOT = "/app" if os.path.exists("/app") else os.getcwd()
 
 def get_app_root():
     """Get the application root directory"""
-    import os
-    return "/app" if os.path.exists("/app") else os.getcwd()
+    return APP_ROOT
+
+@lru_cache(maxsize=1)
+def _structure_types():
+    """Available structure types and default, scanned from the profiles directory once per process."""
+    return get_available_structure_types(get_app_root(), logger)
 
 async def check_and_restart_running_tasks():
     """
@@ -46,12 +77,27 @@ async def check_and_restart_running_tasks():
         
         logger.info(f"🔄 Found {len(running_tasks)} running tasks to restart")
         
-        for task in running_tasks:
-            try:
+        # Restarts are independent and I/O-bound, so run them concurrently (bounded)
+        semaphore = asyncio.Semaphore(RESTART_CONCURRENCY)
+        
+        async def restart_bounded(task):
+            async with semaphore:
                 await restart_task_session(task)
+        
+        # Python 3.12+: start each restart eagerly, running inline up to its first suspension.
+        # Scoped to this fan-out (not set as the loop's task factory): nothing here relies on
+        # the restarts starting after create_task returns.
+        loop = asyncio.get_running_loop()
+        if hasattr(asyncio, "eager_task_factory"):
+            restarts = [asyncio.eager_task_factory(loop, restart_bounded(task)) for task in running_tasks]
+        else:
+            restarts = [loop.create_task(restart_bounded(task)) for task in running_tasks]
+        results = await asyncio.gather(*restarts, return_exceptions=True)
+        for task, result in zip(running_tasks, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Failed to restart task {task['id']}: {result}")
+            else:
                 logger.info(f"✅ Restarted task {task['id']}")
-            except Exception as e:
-                logger.error(f"❌ Failed to restart task {task['id']}: {e}")
                 
         logger.info("🚀 Running tasks restart process completed")
         
@@ -59,8 +105,16 @@ async def check_and_restart_running_tasks():
         logger.error(f"❌ Error in startup task check: {e}")
 
 async def load_running_tasks() -> List[Dict[str, Any]]:
-    """Load all tasks with 'running' status from GCS task JSONs (centralized logic)."""
-    return load_running_tasks_from_gcs()
+    """Load all tasks with 'running' status from GCS task JSONs (centralized logic).
+    The GCS listing and downloads are blocking, so they run in a worker thread to keep
+    the event loop responsive during startup.
+    """
+    return await asyncio.to_thread(load_running_tasks_from_gcs)
+
+async def _run_restarted_scan(session_id: str, session_info: Dict[str, Any]):
+    """Run a restarted scan, at most RESTARTED_SCAN_CONCURRENCY at a time; the rest wait their turn."""
+    async with _restarted_scan_semaphore:
+        await run_lidar_scan_async(session_id, session_info)
 
 async def restart_task_session(task: Dict[str, Any]):
     """
@@ -73,9 +127,9 @@ async def restart_task_session(task: Dict[str, Any]):
         import uuid
         
         # Remove any old sessions for this task from active_sessions
-        old_sessions = [sid for sid, s in active_sessions.items() if s.get("task_id") == task["id"]]
+        old_sessions = list(sessions_by_task.get(task["id"], ()))
         for sid in old_sessions:
-            del active_sessions[sid]
+            remove_session(sid)
             logger.info(f"Removed old session {sid} for task {task['id']} before restart.")
         
         # Extract task parameters
@@ -95,9 +149,8 @@ async def restart_task_session(task: Dict[str, Any]):
         width_km = range_info["width_km"]
         height_km = range_info["height_km"]
         
-        # Get app root and available structure types
-        app_root = get_app_root()
-        available_types, default_type = get_available_structure_types(app_root, logger)
+        # Get available structure types (same for every restarted task)
+        available_types, default_type = _structure_types()
         
         # Create scan configuration with rectangular dimensions
         config = {
@@ -127,8 +180,8 @@ async def restart_task_session(task: Dict[str, Any]):
         tile_size_m = 40
         area_width_m = width_km * 1000
         area_height_m = height_km * 1000
-        tiles_x = max(1, int(np.ceil(area_width_m / tile_size_m)))
-        tiles_y = max(1, int(np.ceil(area_height_m / tile_size_m)))
+        tiles_x = max(1, math.ceil(area_width_m / tile_size_m))
+        tiles_y = max(1, math.ceil(area_height_m / tile_size_m))
         total_tiles = tiles_x * tiles_y
         
         session_info = {
@@ -150,7 +203,7 @@ async def restart_task_session(task: Dict[str, Any]):
             "task_id": task_id  # Critical: link the session to the task
         }
         # Add session to active sessions
-        active_sessions[session_id] = session_info
+        add_session(session_id, session_info)
         
         # Update task data with new session ID
         await update_task_session_id(task_id, session_id)
@@ -173,7 +226,7 @@ async def restart_task_session(task: Dict[str, Any]):
         })
         
         # Start the scanning process in background
-        asyncio.create_task(run_lidar_scan_async(session_id, session_info))
+        asyncio.create_task(_run_restarted_scan(session_id, session_info))
         
         logger.info(f"✅ Restarted task {task_id} with session {session_id}")
         logger.info(f"   📍 Center: {center_lat:.4f}, {center_lon:.4f}")
@@ -184,39 +237,160 @@ async def restart_task_session(task: Dict[str, Any]):
         logger.error(f"❌ Failed to restart task {task['id']}: {e}")
         raise
 
+def _new_pending_update() -> Dict[str, Any]:
+    return {"session_id": None, "progress": None, "findings": []}
+
+def _merge_pending_update(pending: Dict[str, Any], update: Dict[str, Any]) -> None:
+    """Fold one queued update into the pending batch; the latest progress/session wins, findings accumulate."""
+    if update.get("session_id") is not None:
+        pending["session_id"] = update["session_id"]
+    if update.get("progress") is not None:
+        pending["progress"] = update["progress"]
+    if update.get("findings"):
+        pending["findings"].extend(update["findings"])
+
+def _rewrite_task_blob(task_id: str, pending: Dict[str, Any]) -> bool:
+    """
+    Apply a merged batch of updates to a task JSON in GCS (blocking; run in a worker thread).
+    The task as last written here is kept in memory, so repeat updates skip the download.
+    The upload is conditional on the generation the update was based on, so a concurrent
+    save of the same task is never silently overwritten; on a conflict the cached copy is
+    dropped and the task is re-read and the update retried.
+    """
+    client = gcs_utils.get_gcs_client()
+    bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, client)
+    blob_name = f"{GCS_TASKS_PREFIX}{task_id}.json"
+    for attempt in range(TASK_REWRITE_ATTEMPTS):
+        # Pop rather than get: if anything below fails, the half-updated copy must not be reused
+        snapshot = _task_snapshots.pop(task_id, None)
+        if snapshot is not None:
+            generation, task_data = snapshot
+        else:
+            blob = bucket.get_blob(blob_name)
+            if blob is None:
+                logger.error(f"Task file not found for task {task_id} in GCS")
+                return False
+            generation = blob.generation
+            task_data = orjson.loads(blob.download_as_bytes(if_generation_match=generation))
+        now_iso = datetime.now(timezone.utc).isoformat()
+        if pending["session_id"] is not None:
+            task_data["session_id"] = pending["session_id"]
+            task_data["sessions"] = {"scan": pending["session_id"]}
+            task_data["updated_at"] = now_iso
+        progress = pending["progress"]
+        if progress is not None:
+            task_data["progress"] = progress
+            task_data["updated_at"] = now_iso
+            if progress >= 100.0:
+                task_data["status"] = "completed"
+                task_data["completed_at"] = now_iso
+        if pending["findings"]:
+            task_data.setdefault("findings", []).extend(pending["findings"])
+            task_data["updated_at"] = now_iso
+        # Store progress in the current schema, so the GET /tasks read path does not see a
+        # legacy blob and rewrite it concurrently with this writer
+        _ensure_v2_schema(task_data)
+        blob = bucket.blob(blob_name)
+        blob.metadata = _task_blob_metadata(task_data)
+        try:
+            blob.upload_from_string(_serialize_task(task_data), content_type='application/json',
+                                    if_generation_match=generation)
+        except PreconditionFailed:
+            logger.info(f"Task {task_id} changed while updating (attempt {attempt + 1}), retrying")
+            continue
+        if task_data.get("status") == "running":
+            _task_snapshots[task_id] = (blob.generation, task_data)
+        return True
+    logger.error(f"❌ Gave up updating task {task_id} after {TASK_REWRITE_ATTEMPTS} conflicting writes")
+    return False
+
+def _log_task_update(task_id: str, pending: Dict[str, Any]) -> None:
+    session_id = pending["session_id"]
+    progress = pending["progress"]
+    findings = pending["findings"]
+    if session_id is not None:
+        logger.info(f"✅ Updated task {task_id} with new session ID: {session_id}")
+    if progress is not None:
+        if progress >= 100.0:
+            logger.info(f"✅ Task {task_id} completed (100%)")
+        elif progress >= 1.0 and progress % 1.0 == 0:
+            logger.info(f"📊 Task {task_id} progress: {int(progress)}%")
+        elif progress == 0:
+            logger.info(f"🚀 Task {task_id} started")
+    if findings:
+        logger.info(f"🎯 Added {len(findings)} findings to task {task_id}")
+
+async def _task_update_writer(task_id: str, queue: asyncio.Queue, flush_event: asyncio.Event):
+    """
+    Drain a task's update queue in batches: wait up to TASK_FLUSH_INTERVAL (or until a flush
+    is requested), then merge everything queued so far into a single GCS rewrite.
+    Exits (and unregisters) once the queue is empty.
+    """
+    try:
+        while not queue.empty():
+            try:
+                await asyncio.wait_for(flush_event.wait(), timeout=TASK_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            flush_event.clear()
+            async with _task_write_semaphore:
+                pending = _new_pending_update()
+                while not queue.empty():
+                    _merge_pending_update(pending, queue.get_nowait())
+                try:
+                    if await asyncio.to_thread(_rewrite_task_blob, task_id, pending):
+                        _log_task_update(task_id, pending)
+                except Exception as e:
+                    logger.error(f"❌ Failed to update task {task_id}: {e}")
+    finally:
+        if _task_update_queues.get(task_id) is queue:
+            del _task_update_queues[task_id]
+            del _task_flush_events[task_id]
+            del _task_update_writers[task_id]
+
+def _enqueue_task_update(task_id: str, update: Dict[str, Any], flush_now: bool = False) -> None:
+    """
+    Queue an update for a task and start its writer if none is running. The batch is written
+    early when flush_now is set or TASK_FLUSH_MAX_PENDING updates are waiting.
+    """
+    queue = _task_update_queues.get(task_id)
+    if queue is None:
+        queue = _task_update_queues[task_id] = asyncio.Queue()
+        flush_event = _task_flush_events[task_id] = asyncio.Event()
+        queue.put_nowait(update)
+        if flush_now:
+            flush_event.set()
+        _task_update_writers[task_id] = asyncio.create_task(_task_update_writer(task_id, queue, flush_event))
+        return
+    queue.put_nowait(update)
+    if flush_now or queue.qsize() >= TASK_FLUSH_MAX_PENDING:
+        _task_flush_events[task_id].set()
+
+async def flush_task_updates():
+    """Write all pending task updates now and wait for the writers to finish (used on shutdown)."""
+    for flush_event in list(_task_flush_events.values()):
+        flush_event.set()
+    writers = list(_task_update_writers.values())
+    if writers:
+        await asyncio.gather(*writers, return_exceptions=True)
+
 async def update_task_session_id(task_id: str, new_session_id: str):
     """
     Update the session_id for a task in its JSON file in GCS.
+    The write happens in the task's background writer, immediately; this only queues it.
     
     Args:
         task_id: Task ID to update
         new_session_id: New session ID to assign
     """
-    try:
-        from backend.utils import gcs_utils
-        import os
-        GCS_BUCKET_NAME = os.getenv('GCS_TASKS_BUCKET', 're_archaeology')
-        GCS_TASKS_PREFIX = 'tasks/'
-        client = gcs_utils.get_gcs_client()
-        bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, client)
-        blob_name = f"{GCS_TASKS_PREFIX}{task_id}.json"
-        blob = bucket.blob(blob_name)
-        if not blob.exists():
-            logger.error(f"Task file not found for task {task_id} in GCS")
-            return
-        data_bytes = blob.download_as_bytes()
-        task_data = json.loads(data_bytes.decode('utf-8'))
-        task_data["session_id"] = new_session_id
-        task_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        task_data["sessions"] = {"scan": new_session_id}
-        blob.upload_from_string(json.dumps(task_data, indent=2), content_type='application/json')
-        logger.info(f"✅ Updated task {task_id} with new session ID: {new_session_id}")
-    except Exception as e:
-        logger.error(f"❌ Failed to update session ID for task {task_id}: {e}")
+    _enqueue_task_update(task_id, {"session_id": new_session_id}, flush_now=True)
 
 async def update_task_progress(task_id: str, progress: Optional[float] = None, findings: Optional[List[Dict]] = None, tile_data: Optional[Dict] = None):
     """
     Update progress for a running task and save to JSON file in GCS.
+    The write happens in the task's background writer, batched with the other updates
+    queued for the same task within TASK_FLUSH_INTERVAL (completion is written immediately);
+    this only queues it. Progress-only updates within the same whole percent as the last one written are skipped.
     
     Args:
         task_id: Task ID to update
@@ -224,45 +398,19 @@ async def update_task_progress(task_id: str, progress: Optional[float] = None, f
         findings: Optional list of new findings to add (must be a list of dictionaries)
         tile_data: Optional tile data to add to bitmap cache
     """
-    try:
-        from backend.utils import gcs_utils
-        import os
-        GCS_BUCKET_NAME = os.getenv('GCS_TASKS_BUCKET', 're_archaeology')
-        GCS_TASKS_PREFIX = 'tasks/'
-        client = gcs_utils.get_gcs_client()
-        bucket = gcs_utils.get_gcs_bucket(GCS_BUCKET_NAME, client)
-        blob_name = f"{GCS_TASKS_PREFIX}{task_id}.json"
-        blob = bucket.blob(blob_name)
-        if not blob.exists():
-            logger.error(f"Task file not found for task {task_id} in GCS")
+    if findings and not isinstance(findings, list):
+        logger.warning(f"Expected findings to be a list, got {type(findings)}. Converting to list.")
+        findings = [findings]
+    if progress is not None and not findings and progress < 100.0:
+        # Only persist progress when it reaches a new whole percent
+        if int(progress) == int(_last_persisted_progress.get(task_id, -1)):
             return
-        data_bytes = blob.download_as_bytes()
-        task_data = json.loads(data_bytes.decode('utf-8'))
-        if progress is not None:
-            task_data["progress"] = progress
-            task_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-            if progress >= 100.0:
-                task_data["status"] = "completed"
-                task_data["completed_at"] = datetime.now(timezone.utc).isoformat()
-        if findings:
-            if not isinstance(findings, list):
-                logger.warning(f"Expected findings to be a list, got {type(findings)}. Converting to list.")
-                findings = [findings] if findings is not None else []
-            if "findings" not in task_data:
-                task_data["findings"] = []
-            task_data["findings"].extend(findings)
-            task_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        blob.upload_from_string(json.dumps(task_data, indent=2), content_type='application/json')
-        if progress is not None:
-            if progress >= 100.0:
-                logger.info(f"✅ Task {task_id} completed (100%)")
-            elif progress >= 1.0 and progress % 1.0 == 0:
-                logger.info(f"📊 Task {task_id} progress: {int(progress)}%")
-            elif progress == 0:
-                logger.info(f"🚀 Task {task_id} started")
-        if findings and isinstance(findings, list):
-            logger.info(f"🎯 Added {len(findings)} findings to task {task_id}")
-        elif findings:
-            logger.info(f"🎯 Added 1 finding to task {task_id}")
-    except Exception as e:
-        logger.error(f"❌ Failed to update task {task_id}: {e}")
+    if progress is not None:
+        if progress >= 100.0:
+            _last_persisted_progress.pop(task_id, None)
+        else:
+            _last_persisted_progress[task_id] = progress
+    if progress is None and not findings:
+        return
+    _enqueue_task_update(task_id, {"progress": progress, "findings": list(findings or [])},
+                         flush_now=progress is not None and progress >= 100.0)
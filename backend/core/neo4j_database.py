@@ -1,6 +1,7 @@
 """
 Neo4j database connection and session management.
 """
+import asyncio
 import os
 from typing import Generator
 from neo4j import GraphDatabase, Driver
@@ -9,6 +10,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+class SimpleResult:
+    """Minimal stand-in for a neo4j Result: just the fetched records."""
+    def __init__(self, records):
+        self.records = records
+
 class Neo4jDatabase:
     def __init__(self):
         self.driver: Driver = None
@@ -36,9 +42,15 @@ class Neo4jDatabase:
             
             logger.info(f"Attempting to connect to Neo4j at {self.uri}")
             
+            # One driver per process: sessions borrow pooled, kept-alive bolt connections
+            # instead of paying a TCP + auth handshake per query
             self.driver = GraphDatabase.driver(
                 self.uri, 
-                auth=(self.user, self.password)
+                auth=(self.user, self.password),
+                max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+                keep_alive=True,
+                max_transaction_retry_time=15
             )
             
             # Test connection
@@ -70,38 +82,43 @@ class Neo4jDatabase:
         finally:
             session.close()
     
-    async def execute_query(self, query: str, parameters: dict = None, **kwargs):
-        """Execute a single query and return results."""
+    @staticmethod
+    def _merge_parameters(parameters: dict = None, kwargs: dict = None) -> dict:
         # Merge kwargs into parameters dict for compatibility
         if kwargs:
             if parameters is None:
                 parameters = {}
             parameters.update(kwargs)
-            
+        return parameters or {}
+    
+    def run_query(self, query: str, parameters: dict = None, **kwargs) -> list:
+        """
+        Execute a single query and return its records as dicts (blocking; for sync callers).
+        Nodes come back as plain property dicts, projected by the driver in one pass.
+        """
         with self.get_session() as session:
-            result = session.run(query, parameters or {})
-            # Return a result object with records attribute for compatibility
-            records = [record for record in result]
-            
-            # Create a simple result object that mimics neo4j Result
-            class SimpleResult:
-                def __init__(self, records):
-                    self.records = records
-            
-            return SimpleResult(records)
+            result = session.run(query, self._merge_parameters(parameters, kwargs))
+            return result.data()
     
-    async def execute_write_query(self, query: str, parameters: dict = None, **kwargs):
-        """Execute a write query in a transaction."""
-        # Merge kwargs into parameters dict for compatibility
-        if kwargs:
-            if parameters is None:
-                parameters = {}
-            parameters.update(kwargs)
-            
+    def run_write_query(self, query: str, parameters: dict = None, **kwargs):
+        """Execute a write query in a transaction and return its single record (blocking; for sync callers)."""
+        parameters = self._merge_parameters(parameters, kwargs)
         with self.get_session() as session:
             return session.execute_write(
-                lambda tx: tx.run(query, parameters or {}).single()
+                lambda tx: tx.run(query, parameters).single()
             )
+    
+    async def execute_query(self, query: str, parameters: dict = None, **kwargs):
+        """Execute a single query and return results.
+        The driver is synchronous, so the query runs in a worker thread (using a pooled
+        connection) instead of blocking the event loop.
+        """
+        records = await asyncio.to_thread(self.run_query, query, parameters, **kwargs)
+        return SimpleResult(records)
+    
+    async def execute_write_query(self, query: str, parameters: dict = None, **kwargs):
+        """Execute a write query in a transaction (in a worker thread, like execute_query)."""
+        return await asyncio.to_thread(self.run_write_query, query, parameters, **kwargs)
 
 # Global database instance
 neo4j_db = Neo4jDatabase()
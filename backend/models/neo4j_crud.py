@@ -1,8 +1,9 @@
 """
 Neo4j CRUD operations for ontology entities.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union, get_args, get_origin
 from datetime import datetime
+from functools import lru_cache
 from backend.core.neo4j_database import neo4j_db
 from backend.models.ontology_models import *
 import json
@@ -10,12 +11,47 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _field_kinds(model_cls) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Return (datetime_fields, json_fields) for a Pydantic model, computed once per class."""
+    datetime_fields = []
+    json_fields = []
+    for name, field in model_cls.model_fields.items():
+        annotation = field.annotation
+        # Unwrap Optional[X]
+        if get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) == 1:
+                annotation = args[0]
+        origin = get_origin(annotation) or annotation
+        if annotation is datetime:
+            datetime_fields.append(name)
+        elif origin is list and get_args(annotation) == (str,):
+            # Keep string lists as is
+            continue
+        elif origin in (list, dict):
+            json_fields.append(name)
+    return tuple(datetime_fields), tuple(json_fields)
+
 class Neo4jCRUD:
     """Base CRUD operations for Neo4j entities."""
     
     @staticmethod
-    def create_node(label: str, properties: dict) -> dict:
-        """Create a new node with given label and properties."""
+    def _prepare_properties(properties: dict, model_cls=None) -> dict:
+        """Convert property values to types Neo4j can store (in place)."""
+        if model_cls is not None:
+            # Field types are fixed by the model, so only touch the known fields
+            datetime_fields, json_fields = _field_kinds(model_cls)
+            for key in datetime_fields:
+                value = properties.get(key)
+                if value is not None:
+                    properties[key] = value.isoformat()
+            for key in json_fields:
+                value = properties.get(key)
+                if value is not None:
+                    properties[key] = json.dumps(value)
+            return properties
+        
         # Convert datetime objects to ISO strings
         for key, value in properties.items():
             if isinstance(value, datetime):
@@ -26,15 +62,38 @@ class Neo4jCRUD:
             elif isinstance(value, (list, dict)):
                 # Convert complex objects to JSON strings
                 properties[key] = json.dumps(value)
+        return properties
+    
+    @staticmethod
+    def create_node(label: str, properties: dict, model_cls=None) -> dict:
+        """Create a new node with given label and properties."""
+        Neo4jCRUD._prepare_properties(properties, model_cls)
         
         query = f"""
         CREATE (n:{label} $props)
         RETURN n
         """
         
-        result = neo4j_db.execute_write_query(query, {"props": properties})
+        result = neo4j_db.run_write_query(query, {"props": properties})
         return dict(result["n"])
     
+    @staticmethod
+    def create_nodes(label: str, properties_list: List[dict], model_cls=None) -> List[dict]:
+        """Create many nodes with the same label in one round trip (UNWIND)."""
+        if not properties_list:
+            return []
+        rows = [Neo4jCRUD._prepare_properties(properties, model_cls) for properties in properties_list]
+        
+        query = f"""
+        UNWIND $rows AS row
+        CREATE (n:{label})
+        SET n = row
+        RETURN collect(n) AS nodes
+        """
+        
+        result = neo4j_db.run_write_query(query, {"rows": rows})
+        return [dict(node) for node in result["nodes"]]
+    
     @staticmethod
     def get_node_by_id(label: str, node_id: str) -> Optional[dict]:
         """Get a node by its ID."""
@@ -43,8 +102,8 @@ class Neo4jCRUD:
         RETURN n
         """
         
-        results = neo4j_db.execute_query(query, {"id": node_id})
-        return dict(results[0]["n"]) if results else None
+        results = neo4j_db.run_query(query, {"id": node_id})
+        return results[0]["n"] if results else None
     
     @staticmethod
     def get_all_nodes(label: str, limit: int = 100) -> List[dict]:
@@ -56,16 +115,23 @@ class Neo4jCRUD:
         LIMIT $limit
         """
         
-        results = neo4j_db.execute_query(query, {"limit": limit})
-        return [dict(record["n"]) for record in results]
+        results = neo4j_db.run_query(query, {"limit": limit})
+        return [record["n"] for record in results]
     
     @staticmethod
-    def update_node(label: str, node_id: str, properties: dict) -> Optional[dict]:
+    def update_node(label: str, node_id: str, properties: dict, model_cls=None) -> Optional[dict]:
         """Update a node's properties."""
-        # Convert datetime objects to ISO strings
-        for key, value in properties.items():
-            if isinstance(value, datetime):
-                properties[key] = value.isoformat()
+        if model_cls is not None:
+            datetime_fields, _ = _field_kinds(model_cls)
+            for key in datetime_fields:
+                value = properties.get(key)
+                if value is not None:
+                    properties[key] = value.isoformat()
+        else:
+            # Convert datetime objects to ISO strings
+            for key, value in properties.items():
+                if isinstance(value, datetime):
+                    properties[key] = value.isoformat()
         
         query = f"""
         MATCH (n:{label} {{id: $id}})
@@ -73,7 +139,7 @@ class Neo4jCRUD:
         RETURN n
         """
         
-        result = neo4j_db.execute_write_query(query, {"id": node_id, "props": properties})
+        result = neo4j_db.run_write_query(query, {"id": node_id, "props": properties})
         return dict(result["n"]) if result else None
     
     @staticmethod
@@ -85,7 +151,7 @@ class Neo4jCRUD:
         RETURN count(n) as deleted
         """
         
-        result = neo4j_db.execute_write_query(query, {"id": node_id})
+        result = neo4j_db.run_write_query(query, {"id": node_id})
         return result["deleted"] > 0 if result else False
     
     @staticmethod
@@ -105,7 +171,7 @@ class Neo4jCRUD:
         RETURN r
         """
         
-        result = neo4j_db.execute_write_query(query, params)
+        result = neo4j_db.run_write_query(query, params)
         return result is not None
 
 # Specific CRUD classes for each entity
@@ -114,7 +180,7 @@ class UserCRUD(Neo4jCRUD):
     def create_user(user_data: CreateUserRequest) -> User:
         """Create a new user."""
         user = User(**user_data.dict())
-        result = Neo4jCRUD.create_node("User", user.dict())
+        result = Neo4jCRUD.create_node("User", user.dict(), model_cls=User)
         return User(**result)
     
     @staticmethod
@@ -125,15 +191,15 @@ class UserCRUD(Neo4jCRUD):
         RETURN u
         """
         
-        results = neo4j_db.execute_query(query, {"email": email})
-        return User(**dict(results[0]["u"])) if results else None
+        results = neo4j_db.run_query(query, {"email": email})
+        return User(**results[0]["u"]) if results else None
 
 class ThreadCRUD(Neo4jCRUD):
     @staticmethod
     def create_thread(thread_data: CreateThreadRequest) -> Thread:
         """Create a new thread."""
         thread = Thread(**thread_data.dict())
-        result = Neo4jCRUD.create_node("Thread", thread.dict())
+        result = Neo4jCRUD.create_node("Thread", thread.dict(), model_cls=Thread)
         
         # Create WRITES relationship
         Neo4jCRUD.create_relationship(
@@ -153,15 +219,15 @@ class ThreadCRUD(Neo4jCRUD):
         ORDER BY t.created_at DESC
         """
         
-        results = neo4j_db.execute_query(query, {"user_id": user_id})
-        return [Thread(**dict(record["t"])) for record in results]
+        results = neo4j_db.run_query(query, {"user_id": user_id})
+        return [Thread(**record["t"]) for record in results]
 
 class HypothesisCRUD(Neo4jCRUD):
     @staticmethod
     def create_hypothesis(hypothesis_data: CreateHypothesisRequest) -> Hypothesis:
         """Create a new hypothesis."""
         hypothesis = Hypothesis(**hypothesis_data.dict())
-        result = Neo4jCRUD.create_node("Hypothesis", hypothesis.dict())
+        result = Neo4jCRUD.create_node("Hypothesis", hypothesis.dict(), model_cls=Hypothesis)
         
         # Create relationships
         Neo4jCRUD.create_relationship(
@@ -183,7 +249,7 @@ class SiteCRUD(Neo4jCRUD):
     def create_site(site_data: CreateSiteRequest) -> Site:
         """Create a new site."""
         site = Site(**site_data.dict())
-        result = Neo4jCRUD.create_node("Site", site.dict())
+        result = Neo4jCRUD.create_node("Site", site.dict(), model_cls=Site)
         
         # Create MAY_FORM relationship if created from hypothesis
         if site_data.created_from_hypothesis:
@@ -208,17 +274,17 @@ class SiteCRUD(Neo4jCRUD):
         # Rough approximation: 1 degree ~ 111km
         delta = radius_km / 111.0
         
-        results = neo4j_db.execute_query(query, {
+        results = neo4j_db.run_query(query, {
             "lat": lat, "lon": lon, "delta": delta
         })
-        return [Site(**dict(record["s"])) for record in results]
+        return [Site(**record["s"]) for record in results]
 
 class BackgroundTaskCRUD(Neo4jCRUD):
     @staticmethod
     def create_task(task_data: CreateBackgroundTaskRequest) -> BackgroundTask:
         """Create a new background task."""
         task = BackgroundTask(**task_data.dict())
-        result = Neo4jCRUD.create_node("BackgroundTask", task.dict())
+        result = Neo4jCRUD.create_node("BackgroundTask", task.dict(), model_cls=BackgroundTask)
         return BackgroundTask(**result)
 
     @staticmethod
@@ -229,10 +295,10 @@ class BackgroundTaskCRUD(Neo4jCRUD):
     @staticmethod
     def update_task_status(task_id: str, status: TaskStatus, result: Optional[Dict[str, Any]] = None) -> Optional[BackgroundTask]:
         """Update the status and result of a background task."""
-        properties = {"status": status.value, "updated_at": datetime.utcnow()}
+        properties = {"status": status.value, "updated_at": datetime.utcnow().isoformat()}
         if result:
             properties["result"] = json.dumps(result)
-        return Neo4jCRUD.update_node("BackgroundTask", task_id, properties)
+        return Neo4jCRUD.update_node("BackgroundTask", task_id, properties, model_cls=BackgroundTask)
 
     @staticmethod
     def get_all_tasks(limit: int = 100) -> List[BackgroundTask]:
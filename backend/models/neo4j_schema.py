@@ -48,7 +48,7 @@ def create_schema():
     
     for query in SCHEMA_QUERIES:
         try:
-            neo4j_db.execute_query(query)
+            neo4j_db.run_query(query)
             logger.info(f"Executed: {query}")
         except Exception as e:
             logger.warning(f"Failed to execute {query}: {e}")
@@ -61,12 +61,12 @@ def verify_schema():
     
     # Check constraints
     constraints_query = "SHOW CONSTRAINTS"
-    constraints = neo4j_db.execute_query(constraints_query)
+    constraints = neo4j_db.run_query(constraints_query)
     logger.info(f"Found {len(constraints)} constraints")
     
     # Check indexes
     indexes_query = "SHOW INDEXES"
-    indexes = neo4j_db.execute_query(indexes_query)
+    indexes = neo4j_db.run_query(indexes_query)
     logger.info(f"Found {len(indexes)} indexes")
     
     return True
@@ -34,6 +34,9 @@ class Settings(BaseSettings):
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "re_archaeology_pass"
+    # Bolt connection pool shared by all sessions of the process-wide driver
+    NEO4J_MAX_CONNECTION_POOL_SIZE: int = 50
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT: float = 30.0
     
     # Google OAuth configuration
     GOOGLE_CLIENT_ID: str = ""
@@ -57,6 +60,9 @@ class Settings(BaseSettings):
     # CORS and Frontend configuration
     FRONTEND_ORIGINS: str = "http://localhost:8080"
     
+    # Log level for the task API (e.g. WARNING in production to drop per-blob errors)
+    TASKS_LOG_LEVEL: str = "INFO"
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Override with environment variables
@@ -64,6 +70,8 @@ class Settings(BaseSettings):
         self.NEO4J_URI = os.environ.get("NEO4J_URI", self.NEO4J_URI)
         self.NEO4J_USER = os.environ.get("NEO4J_USER", self.NEO4J_USER)
         self.NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", self.NEO4J_PASSWORD)
+        self.NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.environ.get("NEO4J_MAX_CONNECTION_POOL_SIZE", self.NEO4J_MAX_CONNECTION_POOL_SIZE))
+        self.NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.environ.get("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", self.NEO4J_CONNECTION_ACQUISITION_TIMEOUT))
         
         # Google OAuth settings
         self.GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", self.GOOGLE_CLIENT_ID)
@@ -86,6 +94,9 @@ class Settings(BaseSettings):
         
         # Frontend CORS settings
         self.FRONTEND_ORIGINS = os.environ.get("FRONTEND_ORIGINS", self.FRONTEND_ORIGINS)
+        
+        # Logging settings
+        self.TASKS_LOG_LEVEL = os.environ.get("TASKS_LOG_LEVEL", self.TASKS_LOG_LEVEL)
 
     class Config:
         case_sensitive = True
@@ -2,6 +2,7 @@
 General Google Cloud Storage (GCS) utility functions for uploads, downloads, and blob management.
 """
 import os
+from functools import lru_cache
 from typing import Optional
 from google.cloud import storage
 from google.oauth2 import service_account
@@ -13,11 +14,19 @@ GCS_TASK_TILE_URL_PATTERN = "https://storage.googleapis.com/re_archaeology/task_
 
 
 def get_gcs_client(credentials_path: Optional[str] = None, project_id: Optional[str] = None):
-    """Get a GCS client using the given credentials and project."""
+    """Get a GCS client using the given credentials and project.
+    Clients are thread-safe, so one is shared per (credentials, project) to reuse its
+    authorized session and connection pool across calls and worker threads.
+    """
     if not credentials_path:
         credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'sage-striker-294302-b89a8b7e205b.json')
     if not project_id:
         project_id = os.getenv('GOOGLE_EE_PROJECT_ID', 'sage-striker-294302')
+    return _cached_gcs_client(credentials_path, project_id)
+
+
+@lru_cache(maxsize=None)
+def _cached_gcs_client(credentials_path: str, project_id: str):
     if os.path.exists(credentials_path):
         credentials = service_account.Credentials.from_service_account_file(credentials_path)
         return storage.Client(credentials=credentials, project=project_id)
@@ -78,9 +87,12 @@ def blob_exists(bucket, blob_path: str) -> bool:
     return blob.exists()
 
 
-def list_blobs(bucket, prefix: str = ""):
-    """List blobs in a bucket with a given prefix."""
-    return list(bucket.list_blobs(prefix=prefix))
+def list_blobs(bucket, prefix: str = "", fields: Optional[str] = None, delimiter: Optional[str] = None):
+    """List blobs in a bucket with a given prefix.
+    Pass a JSON-API `fields` projection (e.g. "items(name),nextPageToken") to fetch only the needed metadata.
+    Pass delimiter='/' to list only direct children of the prefix (subfolders are skipped server-side).
+    """
+    return list(bucket.list_blobs(prefix=prefix, fields=fields, delimiter=delimiter))
 
 
 def delete_blob(bucket, blob_path: str):
@@ -0,0 +1,98 @@
+"""
+Per-level LiDAR subtile cache stored as a single packed .npz object in GCS.
+
+Each scan level keeps its subtile results as structure-of-arrays (elevation,
+RGB colour, dataset id) indexed by pixel position, instead of one tiny JSON
+blob per subtile.
+"""
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+
+from backend.utils.gcs_utils import upload_blob, safe_download_blob
+
+
+LEVEL_CACHE_PATH_PATTERN = "tasks/{task_id}/cache/level_{level}.npz"
+
+
+class LevelCache:
+    """Packed elevation/colour/dataset arrays for one scan level."""
+
+    def __init__(self, img_h: int, img_w: int):
+        self.elev = np.full((img_h, img_w), np.nan, dtype=np.float32)
+        self.rgb = np.zeros((img_h, img_w, 3), dtype=np.uint8)
+        self.dataset = np.full((img_h, img_w), -1, dtype=np.int8)
+        self.filled = np.zeros((img_h, img_w), dtype=bool)
+        self.dataset_names = []
+
+    @staticmethod
+    def blob_path(task_id: str, level_idx: int) -> str:
+        return LEVEL_CACHE_PATH_PATTERN.format(task_id=task_id, level=level_idx)
+
+    def get(self, py: int, px: int):
+        """Return (elevation, rgb, dataset) for a pixel, or None if not cached."""
+        if not self.filled[py, px]:
+            return None
+        elev = float(self.elev[py, px])
+        if elev != elev:
+            elev = None
+        ds_idx = int(self.dataset[py, px])
+        dataset = self.dataset_names[ds_idx] if ds_idx >= 0 else None
+        return elev, self.rgb[py, px].tolist(), dataset
+
+    def put(self, py: int, px: int, elev, rgb, dataset):
+        """Store one subtile result."""
+        self.elev[py, px] = np.nan if elev is None else elev
+        self.rgb[py, px] = rgb
+        if dataset is None:
+            self.dataset[py, px] = -1
+        else:
+            if dataset not in self.dataset_names:
+                self.dataset_names.append(dataset)
+            self.dataset[py, px] = self.dataset_names.index(dataset)
+        self.filled[py, px] = True
+
+    def to_bytes(self) -> bytes:
+        with BytesIO() as buf:
+            np.savez_compressed(
+                buf,
+                elev=self.elev,
+                rgb=self.rgb,
+                dataset=self.dataset,
+                filled=self.filled,
+                dataset_names=np.array(self.dataset_names, dtype=str),
+            )
+            return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, img_h: int, img_w: int) -> Optional["LevelCache"]:
+        """Decode a cached level; returns None if the stored shape does not match."""
+        with np.load(BytesIO(data)) as npz:
+            if npz["elev"].shape != (img_h, img_w):
+                return None
+            cache = cls(img_h, img_w)
+            cache.elev[...] = npz["elev"]
+            cache.rgb[...] = npz["rgb"]
+            cache.dataset[...] = npz["dataset"]
+            cache.filled[...] = npz["filled"]
+            cache.dataset_names = [str(name) for name in npz["dataset_names"]]
+        return cache
+
+    @classmethod
+    def load(cls, bucket, task_id: str, level_idx: int, img_h: int, img_w: int, logger=None) -> "LevelCache":
+        """Download the level cache once; start an empty one if missing or unreadable."""
+        try:
+            data = safe_download_blob(bucket, cls.blob_path(task_id, level_idx), logger=logger)
+            if data:
+                cache = cls.from_bytes(data, img_h, img_w)
+                if cache is not None:
+                    return cache
+        except Exception as e:
+            if logger:
+                logger.warning(f"[CACHE] Failed to load level cache {level_idx} for {task_id}: {e}")
+        return cls(img_h, img_w)
+
+    def save(self, bucket, task_id: str, level_idx: int):
+        """Upload the whole level as one GCS object."""
+        upload_blob(bucket, self.blob_path(task_id, level_idx), self.to_bytes(), content_type="application/octet-stream")
@@ -13,6 +13,9 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+# Outgoing messages buffered per connection before the client is considered stalled
+OUTBOUND_QUEUE_SIZE = 1000
+
 class ThreadWebSocketManager:
     """Manages WebSocket connections for real-time thread updates."""
     
@@ -23,6 +26,9 @@ class ThreadWebSocketManager:
         self.user_connections: Dict[str, WebSocket] = {}
         # Store connection metadata
         self.connection_metadata: Dict[WebSocket, Dict] = {}
+        # Outgoing messages per connection, each drained by a single sender task
+        self.outbound_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.sender_tasks: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect_to_thread(self, websocket: WebSocket, thread_id: str, user_id: Optional[str] = None):
         """Connect a user to a specific thread for real-time updates."""
@@ -44,6 +50,8 @@ class ThreadWebSocketManager:
             "connected_at": datetime.utcnow().isoformat(),
             "last_activity": datetime.utcnow().isoformat()
         }
+        self.outbound_queues[websocket] = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self.sender_tasks[websocket] = asyncio.create_task(self._sender_loop(websocket))
         
         logger.info(f"User {user_id or 'Anonymous'} connected to thread {thread_id}")
         
@@ -74,8 +82,12 @@ class ThreadWebSocketManager:
         if user_id and user_id in self.user_connections:
             del self.user_connections[user_id]
         
-        # Remove metadata
+        # Remove metadata and stop the sender
         del self.connection_metadata[websocket]
+        self.outbound_queues.pop(websocket, None)
+        sender = self.sender_tasks.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
         
         logger.info(f"User {user_id or 'Anonymous'} disconnected from thread {thread_id}")
         
@@ -88,12 +100,50 @@ class ThreadWebSocketManager:
                 "timestamp": datetime.utcnow().isoformat()
             })
     
+    async def _sender_loop(self, websocket: WebSocket):
+        """Send queued messages for one connection in order; disconnects it on a send failure."""
+        queue = self.outbound_queues[websocket]
+        try:
+            while True:
+                message_text = await queue.get()
+                await websocket.send_text(message_text)
+                
+                # Update last activity
+                if websocket in self.connection_metadata:
+                    self.connection_metadata[websocket]["last_activity"] = datetime.utcnow().isoformat()
+        except asyncio.CancelledError:
+            raise
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending to websocket: {e}")
+        await self.disconnect_from_thread(websocket)
+    
+    def enqueue(self, websocket: WebSocket, message_text: str) -> bool:
+        """Queue an encoded message for a connection; returns False if it is gone or stalled."""
+        queue = self.outbound_queues.get(websocket)
+        if queue is None:
+            return False
+        try:
+            queue.put_nowait(message_text)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Outbound queue full for websocket, dropping connection")
+            return False
+    
+    async def send_to_connection(self, websocket: WebSocket, message: Dict) -> bool:
+        """Send a message to a single connection through its outbound queue."""
+        if self.enqueue(websocket, json.dumps(message)):
+            return True
+        await self.disconnect_from_thread(websocket)
+        return False
+    
     async def broadcast_to_thread(self, thread_id: str, message: Dict, exclude: Optional[WebSocket] = None):
         """Broadcast a message to all users in a specific thread."""
         if thread_id not in self.thread_connections:
             return
         
-        # Convert message to JSON
+        # Convert message to JSON once for all recipients
         message_text = json.dumps(message)
         
         # Get connections for this thread
@@ -103,21 +153,8 @@ class ThreadWebSocketManager:
         if exclude and exclude in connections:
             connections.remove(exclude)
         
-        # Send to all connections
-        disconnected = []
-        for websocket in connections:
-            try:
-                await websocket.send_text(message_text)
-                
-                # Update last activity
-                if websocket in self.connection_metadata:
-                    self.connection_metadata[websocket]["last_activity"] = datetime.utcnow().isoformat()
-                    
-            except WebSocketDisconnect:
-                disconnected.append(websocket)
-            except Exception as e:
-                logger.error(f"Error broadcasting to websocket: {e}")
-                disconnected.append(websocket)
+        # Queue for every connection; the per-connection senders do the actual writes
+        disconnected = [websocket for websocket in connections if not self.enqueue(websocket, message_text)]
         
         # Clean up disconnected websockets
         for websocket in disconnected:
@@ -128,23 +165,7 @@ class ThreadWebSocketManager:
         if user_id not in self.user_connections:
             return False
         
-        websocket = self.user_connections[user_id]
-        message_text = json.dumps(message)
-        
-        try:
-            await websocket.send_text(message_text)
-            
-            # Update last activity
-            if websocket in self.connection_metadata:
-                self.connection_metadata[websocket]["last_activity"] = datetime.utcnow().isoformat()
-            
-            return True
-        except WebSocketDisconnect:
-            await self.disconnect_from_thread(websocket)
-            return False
-        except Exception as e:
-            logger.error(f"Error sending to user {user_id}: {e}")
-            return False
+        return await self.send_to_connection(self.user_connections[user_id], message)
     
     async def broadcast_new_comment(self, thread_id: str, comment_data: Dict, author_id: Optional[str] = None):
         """Broadcast a new comment to all thread participants."""
@@ -263,20 +284,20 @@ async def handle_websocket_message(websocket: WebSocket, message: str):
         
         elif message_type == "ping":
             # Respond with pong to keep connection alive
-            await websocket.send_text(json.dumps({
+            await thread_ws_manager.send_to_connection(websocket, {
                 "type": "pong",
                 "timestamp": datetime.utcnow().isoformat()
-            }))
+            })
         
         elif message_type == "get_participants":
             # Send current thread participants
             participants = thread_ws_manager.get_thread_participants(thread_id)
-            await websocket.send_text(json.dumps({
+            await thread_ws_manager.send_to_connection(websocket, {
                 "type": "participants",
                 "thread_id": thread_id,
                 "participants": participants,
                 "timestamp": datetime.utcnow().isoformat()
-            }))
+            })
         
         else:
             logger.warning(f"Unknown message type: {message_type}")
@@ -291,15 +312,14 @@ async def websocket_heartbeat():
     while True:
         await asyncio.sleep(30)  # Send heartbeat every 30 seconds
         
-        disconnected = []
-        for websocket in list(thread_ws_manager.connection_metadata.keys()):
-            try:
-                await websocket.send_text(json.dumps({
-                    "type": "heartbeat",
-                    "timestamp": datetime.utcnow().isoformat()
-                }))
-            except:
-                disconnected.append(websocket)
+        heartbeat_text = json.dumps({
+            "type": "heartbeat",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        disconnected = [
+            websocket for websocket in list(thread_ws_manager.connection_metadata.keys())
+            if not thread_ws_manager.enqueue(websocket, heartbeat_text)
+        ]
         
         # Clean up disconnected websockets
         for websocket in disconnected:
@@ -600,7 +600,7 @@ export class REArchaeologyApp {
                 context.selected_task = {
                     id: selectedTask.id,
                     status: selectedTask.status,
-                    findings: selectedTask.findings ? selectedTask.findings.length : 0
+                    findings: selectedTask.findings_count ?? (selectedTask.findings ? selectedTask.findings.length : 0)
                 };
             }
         }
@@ -942,73 +942,38 @@ export class REArchaeologyApp {
     }
 
     /**
-     * Load all cached LiDAR tile JSONs for a running task directly from GCS and replay them as if they were live tiles.
+     * Load all cached LiDAR tiles for a running task and replay them as if they were live tiles.
+     * The backend decodes the task's per-level scan caches into tile messages (GET /tasks/{id}/tiles).
      * This is fault-tolerant and deduplicates with live websocket updates.
      * @param {string} taskId
-     * @param {object} options - { gcsBaseUrl, gridX, gridY, levels }
+     * @param {object} options - { gridX, gridY, level }
      */
     async loadCachedTilesForTask(taskId, options = {}) {
-        // Example GCS base URL: 'https://storage.googleapis.com/re_archaeology/tasks/{taskId}/cache/subtile_data/'
-        const gcsBaseUrl = options.gcsBaseUrl || `https://storage.googleapis.com/re_archaeology/tasks/${taskId}/cache/subtile_data/`;
-        const gridX = options.gridX;
-        const gridY = options.gridY;
-        const levels = options.levels || [
-            { res: 8.0, subtiles: 1 },
-            { res: 4.0, subtiles: 2 },
-            { res: 2.0, subtiles: 4 },
-            { res: 1.0, subtiles: 8 }
-        ];
         // Set to deduplicate tiles (level-coarseRow-coarseCol-subtileRow-subtileCol)
         const seenTiles = new Set();
-        this.lidarGridRows = gridY;
-        this.lidarGridCols = gridX;
-        let consecutive404s = 0;
-        const max404s = 20; // Stop after 20 consecutive 404s
-        let foundAnyTiles = false;
+        const levelQuery = options.level !== undefined ? `?level=${options.level}` : '';
+        const url = `${window.AppConfig.apiBase}/tasks/${taskId}/tiles${levelQuery}`;
         
-        if (window.Logger) window.Logger.debug('lidar', '[LIDAR_RESTORE] loadCachedTilesForTask', { taskId, gridX, gridY, levels });
+        if (window.Logger) window.Logger.debug('lidar', '[LIDAR_RESTORE] loadCachedTilesForTask', { taskId, url });
         
-        outerLoop: for (let levelIdx = 0; levelIdx < levels.length; ++levelIdx) {
-            const subtiles = levels[levelIdx].subtiles;
-            for (let coarseRow = 0; coarseRow < gridY; ++coarseRow) {
-                for (let coarseCol = 0; coarseCol < gridX; ++coarseCol) {
-                    for (let subtileRow = 0; subtileRow < subtiles; ++subtileRow) {
-                        for (let subtileCol = 0; subtileCol < subtiles; ++subtileCol) {
-                            const tileKey = `${levelIdx}-${coarseRow}-${coarseCol}-${subtileRow}-${subtileCol}`;
-                            if (seenTiles.has(tileKey)) continue;
-                            
-                            // Stop if we've hit too many consecutive 404s
-                            if (consecutive404s >= max404s) {
-                                if (window.Logger) window.Logger.debug('lidar', `[LIDAR_RESTORE] Stopping after ${consecutive404s} consecutive 404s`);
-                                break outerLoop;
-                            }
-                            
-                            const url = `${gcsBaseUrl}level_${levelIdx}/tile_${coarseRow}_${coarseCol}/subtile_${subtileRow}_${subtileCol}.json`;
-                            if (window.Logger) window.Logger.debug('lidar', '[LIDAR_RESTORE] Fetching tile', url);
-                            try {
-                                const resp = await fetch(url);
-                                if (!resp.ok) {
-                                    consecutive404s++;
-                                    continue;
-                                }
-                                const tileData = await resp.json();
-                                consecutive404s = 0; // Reset counter on success
-                                foundAnyTiles = true;
-                                seenTiles.add(tileKey);
-                                console.log('[LIDAR_RESTORE] Restoring tile', tileKey, tileData);
-                                this.handleLidarTileUpdate(tileData);
-                            } catch (e) {
-                                consecutive404s++;
-                                console.warn('[LIDAR_RESTORE] Failed to fetch/restore tile', url, e);
-                                continue;
-                            }
-                        }
-                    }
+        try {
+            const resp = await fetch(url);
+            if (resp.ok) {
+                const { grid_x: gridX, grid_y: gridY, tiles } = await resp.json();
+                this.lidarGridRows = options.gridY || gridY;
+                this.lidarGridCols = options.gridX || gridX;
+                for (const tileData of tiles) {
+                    const tileKey = `${tileData.level}-${tileData.coarse_row}-${tileData.coarse_col}-${tileData.subtile_row}-${tileData.subtile_col}`;
+                    if (seenTiles.has(tileKey)) continue;
+                    seenTiles.add(tileKey);
+                    this.handleLidarTileUpdate(tileData);
                 }
             }
+        } catch (e) {
+            console.warn('[LIDAR_RESTORE] Failed to fetch/restore cached tiles', url, e);
         }
         
-        if (!foundAnyTiles) {
+        if (seenTiles.size === 0) {
             if (window.Logger) window.Logger.debug('lidar', `[LIDAR_RESTORE] No cached tiles found for task ${taskId}`);
         }
         // Store seenTiles for deduplication with websocket
@@ -281,91 +281,47 @@ export class GCSPollingService {
     }
 
     /**
-     * Discover new tiles that have been uploaded since last check
+     * Discover new tiles saved since last check.
+     * The backend keeps one packed cache per scan level; /tasks/{id}/tiles decodes it into tile messages.
      */
     async discoverNewTiles(taskId, level) {
         const newTiles = [];
         const cacheKey = `${taskId}-${level}-tiles`;
-        const knownTiles = this.tileCache?.get(cacheKey) || new Set();
         
         if (!this.tileCache) {
             this.tileCache = new Map();
         }
+        const knownTiles = this.tileCache.get(cacheKey) || new Set();
 
-        // Discovery runs silently to reduce console noise
-
-        // Get task info to determine actual grid size
-        const app = window.app || window.App || window.reArchaeologyApp;
-        const taskList = app?.taskList;
-        const task = taskList?.tasks?.find(t => t.id === taskId);
-        
-        // Use actual task grid dimensions or reasonable defaults
-        let maxRow = 5, maxCol = 5; // Fallback defaults
-        
-        if (task) {
-            // Try different possible grid size fields
-            maxRow = task.grid_rows || task.gridRows || task.grid_y || maxRow;
-            maxCol = task.grid_cols || task.gridCols || task.grid_x || maxCol;
-        }
-        
-        let checkedCount = 0;
-        let foundCount = 0;
-        
-        // Calculate check limit based on grid size
-        const checkLimit = Math.max(50, maxRow * maxCol * 2);
-
-        // Check a more focused range first
-        for (let row = 0; row < maxRow; row++) {
-            for (let col = 0; col < maxCol; col++) {
-                // For each level, check different subtile patterns based on resolution
-                const maxSubtiles = level === 0 ? 1 : (level === 1 ? 2 : (level === 2 ? 4 : 8));
-                
-                for (let subRow = 0; subRow < maxSubtiles; subRow++) {
-                    for (let subCol = 0; subCol < maxSubtiles; subCol++) {
-                        const tileKey = `${level}-${row}-${col}-${subRow}-${subCol}`;
-                        
-                        if (knownTiles.has(tileKey)) {
-                            continue; // Already processed
-                        }
-
-                        const tileUrl = `https://storage.googleapis.com/re_archaeology/tasks/${taskId}/cache/subtile_data/level_${level}/tile_${row}_${col}/subtile_${subRow}_${subCol}.json`;
-                        checkedCount++;
-                        
-                        try {
-                            const response = await fetch(tileUrl, { method: 'HEAD' });
-                            if (response.ok) {
-                                // New tile found - logged silently
-                                knownTiles.add(tileKey);
-                                foundCount++;
-                                newTiles.push({
-                                    url: tileUrl,
-                                    level,
-                                    row,
-                                    col,
-                                    subRow,
-                                    subCol,
-                                    key: tileKey
-                                });
-                            }
-                        } catch (e) {
-                            // Tile doesn't exist, continue
-                        }
-                        
-                        // Limit the number of requests per discovery cycle
-                        if (checkedCount >= checkLimit) {
-                            break;
-                        }
-                    }
-                    if (checkedCount >= checkLimit) break;
+        try {
+            const response = await fetch(`${window.AppConfig.apiBase}/tasks/${taskId}/tiles?level=${level}`);
+            if (!response.ok) {
+                return newTiles;
+            }
+            const { tiles } = await response.json();
+            for (const tileData of tiles) {
+                const tileKey = `${level}-${tileData.coarse_row}-${tileData.coarse_col}-${tileData.subtile_row}-${tileData.subtile_col}`;
+                if (knownTiles.has(tileKey)) {
+                    continue; // Already processed
                 }
-                if (checkedCount >= checkLimit) break;
+                knownTiles.add(tileKey);
+                newTiles.push({
+                    data: tileData,
+                    level,
+                    row: tileData.coarse_row,
+                    col: tileData.coarse_col,
+                    subRow: tileData.subtile_row,
+                    subCol: tileData.subtile_col,
+                    key: tileKey
+                });
             }
-            if (checkedCount >= checkLimit) break;
+        } catch (e) {
+            // Level cache not available yet, try again next poll
         }
 
         // Only log discovery results when significant number of tiles are found
-        if (foundCount > 10) {
-            console.log('[GCS-POLL] Found', foundCount, 'new tiles for level', level);
+        if (newTiles.length > 10) {
+            console.log('[GCS-POLL] Found', newTiles.length, 'new tiles for level', level);
         }
 
         // Update cache
@@ -380,41 +336,33 @@ export class GCSPollingService {
     async processNewTile(taskId, tileInfo) {
         try {
             // Processing tiles silently to reduce console noise
+            const tileData = tileInfo.data;
             
-            // Fetch the actual tile data
-            const response = await fetch(tileInfo.url);
-            if (response.ok) {
-                const tileData = await response.json();
-                // Tile processing runs silently now that color issue is resolved
-                
-                // Validate tile data before rendering
-                if (!this.validateTileData(tileData)) {
-                    console.warn('[GCS-POLL] Invalid tile data, skipping:', tileInfo.key);
-                    return;
-                }
-                
-                // Add task identification
-                tileData.task_id = taskId;
-                tileData.tile_key = tileInfo.key;
-                
-                // Add level info from tile position  
-                tileData.level = tileInfo.level;
-                
-                // Fix color if it's pure red (backend issue) - generate from elevation
-                if (Array.isArray(tileData.color) && 
-                    tileData.color[0] === 255 && tileData.color[1] === 0 && tileData.color[2] === 0 &&
-                    typeof tileData.elevation === 'number') {
-                    tileData.color = this.elevationToTerrainColor(tileData.elevation);
-                }
-                
-                // Render the tile using existing system (renderLidarSubtile handles animation internally)
-                if (window.renderLidarSubtile) {
-                    window.renderLidarSubtile(tileData);
-                } else {
-                    console.warn('[GCS-POLL] renderLidarSubtile function not available');
-                }
+            // Validate tile data before rendering
+            if (!this.validateTileData(tileData)) {
+                console.warn('[GCS-POLL] Invalid tile data, skipping:', tileInfo.key);
+                return;
+            }
+            
+            // Add task identification
+            tileData.task_id = taskId;
+            tileData.tile_key = tileInfo.key;
+            
+            // Add level info from tile position  
+            tileData.level = tileInfo.level;
+            
+            // Fix color if it's pure red (backend issue) - generate from elevation
+            if (Array.isArray(tileData.color) && 
+                tileData.color[0] === 255 && tileData.color[1] === 0 && tileData.color[2] === 0 &&
+                typeof tileData.elevation === 'number') {
+                tileData.color = this.elevationToTerrainColor(tileData.elevation);
+            }
+            
+            // Render the tile using existing system (renderLidarSubtile handles animation internally)
+            if (window.renderLidarSubtile) {
+                window.renderLidarSubtile(tileData);
             } else {
-                console.warn('[GCS-POLL] Failed to fetch tile data:', response.status);
+                console.warn('[GCS-POLL] renderLidarSubtile function not available');
             }
         } catch (error) {
             console.warn('[GCS-POLL] Error processing new tile:', error);
@@ -756,33 +704,16 @@ export class GCSPollingService {
     async debugCheckTiles(taskId, level = 0) {
         console.log('[GCS-POLL-DEBUG] Manually checking tiles for task', taskId, 'level', level);
         
-        // Try a few specific tile URLs to see what exists
-        const testTiles = [
-            { row: 0, col: 0, subRow: 0, subCol: 0 },
-            { row: 0, col: 1, subRow: 0, subCol: 0 },
-            { row: 1, col: 0, subRow: 0, subCol: 0 },
-            { row: 0, col: 0, subRow: 1, subCol: 0 },
-            { row: 0, col: 0, subRow: 0, subCol: 1 }
-        ];
-
-        for (const tile of testTiles) {
-            const tileUrl = `https://storage.googleapis.com/re_archaeology/tasks/${taskId}/cache/subtile_data/level_${level}/tile_${tile.row}_${tile.col}/subtile_${tile.subRow}_${tile.subCol}.json`;
+        try {
+            const response = await fetch(`${window.AppConfig.apiBase}/tasks/${taskId}/tiles?level=${level}`);
+            console.log('[GCS-POLL-DEBUG] Cached tiles', response.ok ? 'AVAILABLE' : 'NOT FOUND', response.status);
             
-            try {
-                const response = await fetch(tileUrl, { method: 'HEAD' });
-                console.log('[GCS-POLL-DEBUG] Tile', `${tile.row}_${tile.col}_${tile.subRow}_${tile.subCol}`, response.ok ? 'EXISTS' : 'NOT FOUND', response.status);
-                
-                if (response.ok) {
-                    // Try to fetch the actual data
-                    const dataResponse = await fetch(tileUrl);
-                    if (dataResponse.ok) {
-                        const data = await dataResponse.json();
-                        console.log('[GCS-POLL-DEBUG] Tile data sample:', data);
-                    }
-                }
-            } catch (error) {
-                console.log('[GCS-POLL-DEBUG] Error checking tile:', error);
+            if (response.ok) {
+                const { tiles } = await response.json();
+                console.log('[GCS-POLL-DEBUG] Tile count:', tiles.length, 'sample:', tiles[0]);
             }
+        } catch (error) {
+            console.log('[GCS-POLL-DEBUG] Error checking tiles:', error);
         }
     }
 }
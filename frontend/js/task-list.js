@@ -200,7 +200,7 @@ class TaskList {
         const statusColor = this.taskService.getStatusColor(task.status);
         const statusText = this.taskService.getStatusText(task.status);
         const coordinates = this.taskService.formatCoordinates(task.start_coordinates);
-        const findingsCount = task.findings ? task.findings.length : 0;
+        const findingsCount = task.findings_count ?? (task.findings ? task.findings.length : 0);
         const opacityValue = Math.max(0.3, task.decay_value);
         
         // Clean styling for running tasks - let CSS handle the visual indicators
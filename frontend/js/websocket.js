@@ -104,6 +104,17 @@ export function triggerCatchupForRunningTasks(app, runningTasks) {
     });
 }
 
+/**
+ * Text frames are JSON as-is; binary frames are zlib-compressed JSON
+ */
+function decodeWebSocketFrame(frame) {
+    if (typeof frame === 'string') {
+        return frame;
+    }
+    const stream = new Blob([frame]).stream().pipeThrough(new DecompressionStream('deflate'));
+    return new Response(stream).text();
+}
+
 export function connectWebSocket(app) {
     try {
         if (app.websocket) {
@@ -157,14 +168,21 @@ export function connectWebSocket(app) {
                 }
             }
         };
+        // Large broadcasts arrive as zlib-compressed binary frames; decode them in arrival
+        // order with the plain text frames
+        app.websocket.binaryType = 'arraybuffer';
+        let messageChain = Promise.resolve();
         app.websocket.onmessage = (event) => {
-            try {
-                const data = JSON.parse(event.data);
-                console.log('[WEBSOCKET] Message received:', data.type, data);
-                handleWebSocketMessage(app, data);
-            } catch (error) {
-                console.error('❌ WebSocket message error:', error);
-            }
+            messageChain = messageChain
+                .then(() => decodeWebSocketFrame(event.data))
+                .then((text) => {
+                    const data = JSON.parse(text);
+                    console.log('[WEBSOCKET] Message received:', data.type, data);
+                    handleWebSocketMessage(app, data);
+                })
+                .catch((error) => {
+                    console.error('❌ WebSocket message error:', error);
+                });
         };
         app.websocket.onclose = (event) => {
             console.log('🔌 WebSocket disconnected:', event.code, event.reason);
@@ -186,6 +204,16 @@ export function connectWebSocket(app) {
 }
 
 export function handleWebSocketMessage(app, data) {
+    if (data.type === 'multi') {
+        // Several broadcasts coalesced by the server into one frame
+        (data.payload || []).forEach(message => handleWebSocketMessage(app, message));
+        return;
+    }
+    if (data.type === 'lidar_tile_batch') {
+        // One message per coarse tile: handle each subtile as an individual lidar_tile
+        (data.tiles || []).forEach(tile => handleWebSocketMessage(app, tile));
+        return;
+    }
     if (window.Logger && data.type !== 'lidar_tile') {
         window.Logger.websocket('debug', `Message received: ${data.type}`, { keys: Object.keys(data) });
     }
@@ -27,5 +27,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8080,
         reload=True,
-        log_level="info"
+        log_level="info",
+        ws_per_message_deflate=False
     )
\ No newline at end of file
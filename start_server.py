@@ -57,7 +57,9 @@ if __name__ == "__main__":
         reload=False,  # Disable reload in container
         log_level="info",
         access_log=True,
-        workers=1
+        workers=1,
+        # Large discovery broadcasts are compressed once in the app; don't deflate per connection
+        ws_per_message_deflate=False
     )
     
     server = uvicorn.Server(config)